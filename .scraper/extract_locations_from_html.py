@@ -5,193 +5,275 @@
 
 import os
 import re
+import json
+import hashlib
+import logging
+import threading
+import unicodedata
 import html
+from urllib.parse import urljoin
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selectolax.lexbor import LexborHTMLParser
+from rapidfuzz import fuzz, process
 
 # The website URL where we get the location data
 # We found this URL by looking at the Unisport website
 SOURCE_URL = "https://www.sportprogramm.unisg.ch/unisg/cgi/webpage.cgi?orte"
 
 
+# Logger for this module, used for the diagnostic (debug) output only.
+# Progress messages stay plain print() calls so they always show up in the scraper/CI output.
+# Debug messages are only shown when main() below enables them (file run directly).
+logger = logging.getLogger(__name__)
+
+# Regular expressions we use on every run
+# We compile them once here (at import time) instead of inside the functions,
+# so each call can use them directly without looking them up or compiling them again
+# _MARKERS_RE looks for "var markers=" followed by an array
+# re.S means "dot matches newline": this is needed because the array might span multiple lines
+_MARKERS_RE = re.compile(r"var\s+markers\s*=\s*(\[.*?\]);", re.S)
+# _MARKER_ITEM_RE finds one [lat,lng,"name"] entry inside the markers array
+_MARKER_ITEM_RE = re.compile(r'\[\s*([-\d.]+)\s*,\s*([-\d.]+)\s*,\s*"([^"]*)"')
+# _MENU_START_RE finds the start of the location menu (<div class="bs_flmenu">)
+_MENU_START_RE = re.compile(r'<div[^>]*class="[^"]*\bbs_flmenu\b')
+
+# _SPID_RE finds the spid parameter in a location link (like ...?spid=123&other=value)
+_SPID_RE = re.compile(r"[?&]spid=([^&#]+)")
+
+# Folder where we keep a copy of downloaded pages (together with their ETag / Last-Modified)
+# This folder is in .gitignore, it's only a local cache
+HTTP_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".http_cache")
+
+
+# One shared requests session for all downloads of this module
+# A session keeps the connection to the server open (connection pooling), so further
+# requests don't need a new TCP/TLS handshake. The adapter also retries a request up to
+# 3 times (with a short, growing pause) if the server is temporarily unavailable.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+    ),
+)
+
+
 # Function to get the HTML from a website
 # We use the requests library to download web pages
 # The User-Agent header makes us look like a normal browser (some websites block scripts that don't have this)
 # timeout=30 means we wait up to 30 seconds for the page to load
-def fetch_html(url):
-    response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=30)
+#
+# To avoid downloading the same page again and again, we use a "conditional GET":
+# we remember the ETag / Last-Modified headers of the last download and send them back.
+# If the page didn't change, the server answers with 304 (Not Modified) and no body,
+# and we simply read our saved copy instead.
+# Other scripts can pass their own requests session (for example one with different SSL settings).
+def fetch_html(url, cache_dir=HTTP_CACHE_DIR, session=None):
+    if session is None:
+        session = _SESSION
+    
+    # Each URL gets its own cache files (the name is a hash of the URL)
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    body_path = os.path.join(cache_dir, key + ".html")
+    meta_path = os.path.join(cache_dir, key + ".json")
+    
+    headers = {"User-Agent": "Mozilla/5.0"}
+    if os.path.exists(body_path) and os.path.exists(meta_path):
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        except (OSError, ValueError):
+            # Broken cache file: just download the page normally
+            pass
+    
+    response = session.get(url, headers=headers, timeout=30)
+    
+    # 304 means "nothing changed since your last download": use our saved copy
+    if response.status_code == 304:
+        with open(body_path, "r", encoding="utf-8") as f:
+            return f.read()
+    
     # raise_for_status() checks if the request was successful
     # If the website returned an error (like 404), this will stop the script
     response.raise_for_status()
+    
+    # Turn the downloaded bytes into text ourselves
+    # response.encoding is the charset from the Content-Type header; for text/* responses
+    # without one, requests uses ISO-8859-1 (the HTTP default), exactly like response.text.
+    # Only when requests has no encoding at all would response.text run a slow charset
+    # detection over the whole body - in that case we use UTF-8 instead.
+    # (The body is already gzip-decompressed by requests, which asks for gzip by default.)
+    encoding = response.encoding or "utf-8"
+    html_text = response.content.decode(encoding, errors="replace")
+    
+    # Save the page and its headers for the next run (only if the server sent any)
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # We first write to a temporary file and then rename it: this way a crash
+            # (or a parallel download) never leaves a half-written page in the cache
+            tmp_suffix = ".tmp" + str(os.getpid()) + "_" + str(threading.get_ident())
+            with open(body_path + tmp_suffix, "w", encoding="utf-8") as f:
+                f.write(html_text)
+            os.replace(body_path + tmp_suffix, body_path)
+            with open(meta_path + tmp_suffix, "w", encoding="utf-8") as f:
+                json.dump({"etag": etag, "last_modified": last_modified}, f)
+            os.replace(meta_path + tmp_suffix, meta_path)
+        except OSError:
+            # The cache is only an optimization, so we don't fail if we can't write it
+            pass
+    
     # Return the HTML as text so we can search through it
-    return response.text
+    return html_text
 
 
 # Function to find the markers in the HTML
 # The website stores location coordinates in JavaScript code
 # It looks like: var markers=[[47.42901,9.38402,"Athletik Zentrum"], ...];
 # We need to extract this data and convert it to a format we can use
+# The result is "column based": three lists of the same length instead of one dictionary per marker
+#     {"name": [...], "lat": [...], "lng": [...]}
+# Position i in each list belongs to the same marker (this saves creating a dictionary for every marker)
 def parse_markers(html_text):
-    # Use regular expressions to find the markers array
-    # The pattern looks for "var markers=" followed by an array
-    # re.S means "dot matches newline": this is needed because the array might span multiple lines
-    pattern = r"var\s+markers\s*=\s*\[(.*?)\];"
-    match = re.search(pattern, html_text, re.S)
+    # Use the regular expression _MARKERS_RE (see top of the file) to find the markers array
+    match = _MARKERS_RE.search(html_text)
+    names = []
+    lats = []
+    lngs = []
+    result = {"name": names, "lat": lats, "lng": lngs}
     if not match:
-        # If we can't find the markers, return empty list
-        return []
+        # If we can't find the markers, return empty lists
+        return result
     
-    # match.group(1) gets the content inside the brackets
-    # This is the actual array data
+    # match.group(1) gets the whole array including the outer brackets
     content = match.group(1)
     
-    # Split by "],[" to separate each marker entry
-    # Each entry is one location with its coordinates
-    items = content.split("],[")
+    # Each marker looks like [47.42901,9.38402,"Athletik Zentrum"]
+    # This happens to be valid JSON, so json.loads can read the whole array at once
+    # (this runs in C and is much faster than going through the text character by character)
+    try:
+        data = json.loads(content)
+    except ValueError:
+        data = None
     
-    result = []
-    for item in items:
-        # Clean up the item: remove extra brackets and spaces
-        item = item.strip()
-        if item.startswith("["):
-            item = item[1:]
-        if item.endswith("]"):
-            item = item[:-1]
-        
-        # Now we need to split by comma, but it's tricky because names might contain commas
-        # For example: "Athletik Zentrum, Gymnastikraum" has a comma in the name
-        # So we need to be smart about splitting: only split commas that are NOT inside quotes
-        parts = []
-        current_part = ""
-        inside_quotes = False
-        
-        # Go through each character and build the parts
-        for char in item:
-            # If we see a quote, we're either entering or leaving a quoted section
-            if char == '"':
-                inside_quotes = not inside_quotes
-                current_part += char
-            # If we see a comma and we're NOT inside quotes, this is a real separator
-            elif char == ',' and not inside_quotes:
-                # Save the part we've built so far
-                parts.append(current_part.strip())
-                # Start a new part
-                current_part = ""
-            else:
-                # Just add the character to the current part
-                current_part += char
-        
-        # Don't forget the last part (after the last comma)
-        if current_part:
-            parts.append(current_part.strip())
-        
-        # Each marker should have at least 3 parts: latitude, longitude, and name
-        # If it doesn't, skip it (it's probably corrupted data)
-        if len(parts) < 3:
-            continue
-        
-        # Try to convert the parts to the right format
+    if isinstance(data, list):
+        for item in data:
+            # Each marker should have at least 3 parts: latitude, longitude, and name
+            # If it doesn't, skip it (it's probably corrupted data)
+            if not isinstance(item, list) or len(item) < 3:
+                continue
+            try:
+                # Parts 0 and 1 are numbers (coordinates), part 2 is the location name (text)
+                # We convert everything first, so a broken marker never ends up half-added
+                lat, lng, name = float(item[0]), float(item[1]), str(item[2]).strip()
+            except (TypeError, ValueError):
+                # If conversion fails (maybe the coordinates aren't numbers), skip this marker
+                continue
+            names.append(name)
+            lats.append(lat)
+            lngs.append(lng)
+        return result
+    
+    # Fallback: if the array is not valid JSON (for example a trailing comma),
+    # we find each [lat,lng,"name"] entry with a regular expression instead
+    # The name is inside quotes, so commas in names (like "Athletik Zentrum, Gymnastikraum") are no problem
+    for entry in _MARKER_ITEM_RE.finditer(content):
         try:
-            # Parts 0 and 1 are numbers (coordinates)
-            lat = float(parts[0])
-            lng = float(parts[1])
-            # Part 2 is the location name (text)
-            name = parts[2].strip()
-            # Remove quotes if they're still there
-            if name.startswith('"') and name.endswith('"'):
-                name = name[1:-1]
-            # Add to our result list as a dictionary
-            result.append({"name": name, "lat": lat, "lng": lng})
-        except:
-            # If conversion fails (maybe the coordinates aren't numbers), skip this marker
+            lat, lng = float(entry.group(1)), float(entry.group(2))
+        except ValueError:
             continue
+        names.append(entry.group(3).strip())
+        lats.append(lat)
+        lngs.append(lng)
     
     return result
 
 
-# Function to get the sports for each location from the menu
-# The website has a menu that shows which sports are offered at each location
-# We need to parse this HTML menu to extract that information
-def parse_location_sports(html_content):
-    # We'll build a dictionary: location name maps to list of sports
-    mapping = {}
-    # BeautifulSoup helps us parse HTML: it's like a magnifying glass for HTML
-    soup = BeautifulSoup(html_content, "lxml")
+# Function to turn the HTML text into a tree we can search
+# Parsing is the most expensive step, so we do it only once and share the tree
+# between all the functions that need to look at the menu
+def _parse(html_content):
+    # We only need the location menu (div.bs_flmenu), not the whole page with all its
+    # scripts, styles and map markup. So we cut the HTML right before the menu starts
+    # and only parse the rest: the parser then has much less work to do.
+    # (The markers are read with a regular expression from the full text, so they are not affected.)
+    menu_start = _MENU_START_RE.search(html_content)
+    if menu_start:
+        html_content = html_content[menu_start.start():]
+    
+    # The HTML parser turns the page into a tree we can search: it's like a magnifying glass for HTML
+    # We use selectolax (Lexbor engine) because it parses in C and is much faster than BeautifulSoup
+    return LexborHTMLParser(html_content)
+
+
+# Function to read the location menu in one single pass
+# The website has a menu that shows which sports are offered at each location,
+# and each location also has a link to its detail page (the link contains an ID called spid)
+# Instead of walking through the menu twice (once for sports, once for links),
+# we fill both dictionaries at the same time
+def parse_menu(tree, base_url=None):
+    # sports_map: location name maps to list of sports
+    # links_map: location name maps to {"href": full_url, "spid": id}
+    sports_map = {}
+    links_map = {}
     
     # Find the menu using CSS selectors
     # "div.bs_flmenu > ul" means: find a div with class "bs_flmenu", then find its direct child ul
-    menu = soup.select_one("div.bs_flmenu > ul")
+    menu = tree.css_first("div.bs_flmenu > ul")
     if not menu:
-        # If there's no menu, return empty dictionary
-        return mapping
+        # If there's no menu, return empty dictionaries
+        return sports_map, links_map
+    
+    # If no base URL is provided, use the default one
+    # This is needed because links on the page might be relative (like "../page.html")
+    # We need to convert them to absolute URLs (like "https://example.com/page.html")
+    if base_url is None:
+        base_url = "https://www.sportprogramm.unisg.ch/unisg/angebote/aktueller_zeitraum/"
     
     # Go through each location in the menu
-    # recursive=False means we only look at direct children, not nested items
-    for li in menu.find_all("li", recursive=False):
+    # iter() only gives us the direct children, not nested items
+    for li in menu.iter():
+        if li.tag != "li":
+            continue
         # Each location has a span with class "bs_spname" that contains the name
-        name_element = li.select_one("span.bs_spname")
+        name_element = li.css_first("span.bs_spname")
         if not name_element:
             # Skip if we can't find the name
             continue
         
         # Get the text and unescape HTML entities (like &#228; becomes ä)
         # This is important because the website uses HTML encoding
-        location_name = html.unescape(name_element.get_text(strip=True))
+        location_name = html.unescape(name_element.text(strip=True))
         
         # Now find all the sports listed under this location
         # The sports are in links inside nested lists
         sports = []
-        for link in li.select("ul > li > a"):
-            sport_name = html.unescape(link.get_text(strip=True))
+        for link in li.css("ul > li > a"):
+            sport_name = html.unescape(link.text(strip=True))
             # Only add if it's not empty and not the same as the location name
             if sport_name and sport_name != location_name:
                 sports.append(sport_name)
-        
-        # Store the mapping
-        mapping[location_name] = sports
-    
-    return mapping
-
-
-# Function to get the links and IDs for each location
-# Each location has a link to its detail page, and the link contains an ID (spid)
-# We need to extract both the full URL and the ID from the link
-def parse_location_links(html_content, base_url=None):
-    from urllib.parse import urljoin, urlparse, parse_qs
-    
-    # Result will be: location name maps to {"href": full_url, "spid": id}
-    result = {}
-    soup = BeautifulSoup(html_content, "lxml")
-    
-    # Find the same menu as before
-    menu = soup.select_one("div.bs_flmenu > ul")
-    if not menu:
-        return result
-    
-    # If no base URL is provided, use the default one
-    # This is needed because links on the page might be relative (like "../page.html")
-    # We need to convert them to absolute URLs (like "https://example.com/page.html")
-    if base_url is None:
-        base_url = "https://www.sportprogramm.unisg.ch/unisg/angebote/aktueller_zeitraum/"
-    
-    # Go through each location
-    for li in menu.find_all("li", recursive=False):
-        # Get location name (same as before)
-        name_element = li.select_one("span.bs_spname")
-        if not name_element:
-            continue
-        
-        location_name = html.unescape(name_element.get_text(strip=True))
+        sports_map[location_name] = sports
         
         # Find the link element
         # "a[href]" means: find an anchor tag that has an href attribute
-        link_element = li.select_one("a[href]")
+        link_element = li.css_first("a[href]")
         full_href = None
         spid = None
         
         if link_element:
             # Get the href attribute (the link address)
-            href = link_element.get("href")
+            href = link_element.attributes.get("href")
             if href:
                 # Convert relative URL to absolute URL
                 # urljoin combines the base URL with the relative path
@@ -199,57 +281,68 @@ def parse_location_links(html_content, base_url=None):
                 
                 # Now extract the spid from the URL
                 # URLs can have query parameters like: ?spid=123&other=value
-                # We want to get the spid value
-                try:
-                    # urlparse splits the URL into parts
-                    parsed_url = urlparse(full_href)
-                    # parse_qs extracts the query parameters as a dictionary
-                    query_params = parse_qs(parsed_url.query)
-                    # Check if spid exists in the parameters
-                    if "spid" in query_params:
-                        # parse_qs returns lists, so we take the first element
-                        spid = query_params["spid"][0]
-                except:
-                    # If something goes wrong, just set spid to None
-                    spid = None
+                # We only need this one value, so a regular expression is enough
+                # (no need to split the whole URL into a dictionary of parameters)
+                spid_match = _SPID_RE.search(full_href)
+                if spid_match:
+                    spid = spid_match.group(1)
         
-        # Store the result
-        result[location_name] = {"href": full_href, "spid": spid}
+        links_map[location_name] = {"href": full_href, "spid": spid}
     
-    return result
+    return sports_map, links_map
 
 
-# Function to find a similar name (for when names don't match exactly)
+# Function to find similar names (for when names don't match exactly)
 # Sometimes the same location has slightly different names in different parts of the website
-# For example: "Athletik Zentrum" vs "Athletik Zentrum" (with different spacing)
-# This function uses "fuzzy matching" to find the best match
-def fuzzy_match_name(target, candidates, threshold=0.85):
-    from difflib import SequenceMatcher
+# For example: "Athletik Zentrum" vs "Athletik-Zentrum"
+# This function uses "fuzzy matching" to find the best match for every target at once
+# It returns a list with one entry per target: the best candidate, or None if nothing is similar enough
+def fuzzy_match_names(targets, candidates, candidates_normalized=None, threshold=0.85):
+    if not targets or not candidates:
+        return [None] * len(targets)
     
-    # Convert to lowercase and remove extra spaces for comparison
-    # This makes matching more reliable (case-insensitive)
-    target_lower = target.strip().lower()
-    best_match = None
-    best_score = 0.0
+    # candidates_normalized is an optional list with the already normalized candidates
+    # (same order as candidates). When we match many names against the same list,
+    # normalizing the candidates once up front saves a lot of repeated string work.
+    if candidates_normalized is None:
+        candidates_normalized = [_normalize_name(c) for c in candidates]
     
-    # Try each candidate and see which one is most similar
-    for candidate in candidates:
-        candidate_lower = candidate.strip().lower()
-        # SequenceMatcher compares two strings and gives a score from 0.0 to 1.0
-        # 1.0 means identical, 0.0 means completely different
-        # ratio() gives us the similarity score
-        similarity = SequenceMatcher(None, target_lower, candidate_lower).ratio()
-        # Keep track of the best match we've found so far
-        if similarity > best_score:
-            best_score = similarity
-            best_match = candidate
+    # rapidfuzz does the comparison in C++ instead of pure Python (much faster than difflib)
+    # process.cdist compares ALL targets with ALL candidates in one single call and
+    # gives us a table (matrix) of scores: one row per target, one column per candidate
+    # fuzz.ratio gives the same kind of score as difflib's SequenceMatcher.ratio(),
+    # but on a scale from 0 to 100 instead of 0.0 to 1.0
+    # score_cutoff lets rapidfuzz skip candidates early that can't reach the threshold
+    # (their score is set to 0), and workers=-1 uses all CPU cores
+    cutoff = threshold * 100
+    scores = process.cdist(
+        [_normalize_name(t) for t in targets],
+        candidates_normalized,
+        scorer=fuzz.ratio,
+        processor=None,
+        score_cutoff=cutoff,
+        workers=-1,
+    )
     
-    # Only return a match if it's similar enough
+    # For every row, take the column with the highest score
     # threshold=0.85 means at least 85% similar
-    # If the best match isn't good enough, return None (no match found)
-    if best_score >= threshold:
-        return best_match
-    return None
+    # We use the column index to return the original (not normalized) candidate name
+    best = scores.argmax(axis=1)
+    result = []
+    for row, col in enumerate(best):
+        if scores[row, col] >= cutoff:
+            result.append(candidates[col])
+        else:
+            result.append(None)
+    return result
+
+
+# Helper to normalize a name before comparing it
+# - html.unescape turns leftover entities (like &amp;) into normal characters
+# - NFKC makes different ways of writing the same character identical (for example "ä" vs "a" + "¨")
+# - strip() removes surrounding spaces and casefold() is a stronger version of lower()
+def _normalize_name(name):
+    return unicodedata.normalize("NFKC", html.unescape(name)).strip().casefold()
 
 
 def extract_locations(use_cached: bool = False, cached_file: str | None = None):
@@ -282,75 +375,99 @@ def extract_locations(use_cached: bool = False, cached_file: str | None = None):
     # 1. Markers: coordinates and names from JavaScript
     markers = parse_markers(html_text)
     # 2. Location sports: which sports are offered at each location (from the menu)
-    loc_to_sports = parse_location_sports(html_text)
     # 3. Location links: URLs and IDs for each location (also from the menu)
-    loc_links = parse_location_links(html_text)
+    # We parse the HTML only once and read both from the menu in a single pass
+    tree = _parse(html_text)
+    loc_to_sports, loc_links = parse_menu(tree)
     
-    # Print debug information to see what we found
+    # Log debug information to see what we found
     # This helps us understand if our parsing is working correctly
-    print("\n=== DEBUG INFO ===")
-    print("Markers found:", len(markers))
-    print("First 5 marker names:", [m['name'] for m in markers[:5]])
-    print("Location sports count:", len(loc_to_sports))
-    print("First 5 location names:", list(loc_to_sports.keys())[:5])
-    print("Location links count:", len(loc_links))
-    print("First 5 link names:", list(loc_links.keys())[:5])
-    print("=================\n")
+    # The "if" makes sure we don't even build the sample lists when debug logging is off
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Markers found: %d", len(markers["name"]))
+        logger.debug("First 5 marker names: %s", markers["name"][:5])
+        logger.debug("Location sports count: %d", len(loc_to_sports))
+        logger.debug("First 5 location names: %s", list(loc_to_sports.keys())[:5])
+        logger.debug("Location links count: %d", len(loc_links))
+        logger.debug("First 5 link names: %s", list(loc_links.keys())[:5])
     
     # Now we need to combine all the data
     # The challenge is that the same location might appear in multiple sources
     # We need to match them up and merge the information
-    merged = []
-    seen_names = set()  # Keep track of names we've already processed (to avoid duplicates)
+    # We build a dictionary keyed by location name: this removes duplicates automatically
+    # and lets us check in O(1) whether a name was already added
+    merged_by_name = {}
     fuzzy_matches = []  # Track when we used fuzzy matching (debug only)
     exact_matches = 0   # Count how many exact matches we found (debug only)
     
+    # Prepare the candidate names for fuzzy matching only once (not once per marker)
+    candidate_keys = list(loc_links.keys())
+    candidate_norm = [_normalize_name(k) for k in candidate_keys]
+    # Dictionary from normalized name to the original menu name
+    # Most "different" names only differ in spacing, case or encoding, so after
+    # normalizing them a simple dictionary lookup finds them (no fuzzy matching needed)
+    links_by_norm = {}
+    for key, norm in zip(candidate_keys, candidate_norm):
+        links_by_norm.setdefault(norm, key)
+    
     # Process markers first (these have coordinates)
-    for marker in markers:
-        name = str(marker["name"])
+    # First pass: find the link data by exact or normalized name
+    # Markers we can't match this way are collected and fuzzy matched together afterwards
+    unmatched = []  # Names that still need fuzzy matching
+    for name, lat, lng in zip(markers["name"], markers["lat"], markers["lng"]):
         # Skip if we've already seen this name
-        if name in seen_names:
+        if name in merged_by_name:
             continue
-        seen_names.add(name)
         
         # Try to find matching link data
         # First try exact match (same name)
-        link_data = loc_links.get(name, {})
-        if link_data:
+        link_name = name if name in loc_links else None
+        if link_name is None:
+            # Then try the normalized name (handles spacing, case and encoding differences)
+            link_name = links_by_norm.get(_normalize_name(name))
+        if link_name is not None:
             exact_matches += 1
         else:
-            # If exact match fails, try fuzzy matching
-            # This handles cases where names are slightly different
-            fuzzy_match = fuzzy_match_name(name, list(loc_links.keys()))
-            if fuzzy_match:
-                fuzzy_matches.append((name, fuzzy_match))
-                print("Fuzzy match found:", name, "->", fuzzy_match)
-                link_data = loc_links.get(fuzzy_match, {})
+            unmatched.append(name)
         
-        # Add to merged list with all the information we have
-        merged.append({
+        # loc_links.get() returns None when there is no link (no empty {} needed)
+        link_data = loc_links.get(link_name) if link_name else None
+        # Add to merged dictionary with all the information we have
+        merged_by_name[name] = {
             "name": name,
-            "lat": marker["lat"],
-            "lng": marker["lng"],
-            "ort_href": link_data.get("href") if link_data else None,
-            "spid": link_data.get("spid") if link_data else None,
-        })
+            "lat": lat,
+            "lng": lng,
+            "ort_href": link_data["href"] if link_data else None,
+            "spid": link_data["spid"] if link_data else None,
+        }
+    
+    # Second pass: fuzzy matching for all remaining names in one single call
+    # This handles real typos where names are slightly different
+    fuzzy_results = fuzzy_match_names(unmatched, candidate_keys, candidate_norm)
+    for name, fuzzy_match in zip(unmatched, fuzzy_results):
+        if fuzzy_match:
+            fuzzy_matches.append((name, fuzzy_match))
+            logger.debug("Fuzzy match found: %s -> %s", name, fuzzy_match)
+            link_data = loc_links[fuzzy_match]
+            merged_by_name[name]["ort_href"] = link_data["href"]
+            merged_by_name[name]["spid"] = link_data["spid"]
     
     # Also add locations that are only in the menu (not in markers)
     # These locations don't have coordinates, but they might have other information
-    menu_only = []
-    for name, sports in loc_to_sports.items():
-        if name not in seen_names:
-            menu_only.append(name)
-            link_info = loc_links.get(name, {})
-            merged.append({
-                "name": name,
-                "lat": None,  # No coordinates available
-                "lng": None,  # No coordinates available
-                "ort_href": link_info.get("href") if link_info else None,
-                "spid": link_info.get("spid") if link_info else None,
-            })
+    # We loop over the menu (not a set difference) so the menu order is kept
+    for name in loc_to_sports:
+        if name in merged_by_name:
+            continue
+        link_info = loc_links.get(name)
+        merged_by_name[name] = {
+            "name": name,
+            "lat": None,  # No coordinates available
+            "lng": None,  # No coordinates available
+            "ort_href": link_info["href"] if link_info else None,
+            "spid": link_info["spid"] if link_info else None,
+        }
 
+    merged = list(merged_by_name.values())
     return merged
 
 
@@ -360,6 +477,12 @@ def main():
     some statistics to the console. For the production pipeline,
     only extract_locations() should be imported and used.
     """
+    # Show the debug messages of extract_locations() when we run this file directly
+    # Only this module's logger is set to DEBUG - the root logger stays at INFO,
+    # otherwise urllib3 would log every single HTTP connection as well
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logger.setLevel(logging.DEBUG)
+    
     merged = extract_locations(use_cached=False)
 
     print("\n=== MERGE RESULTS ===")
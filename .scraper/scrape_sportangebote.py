@@ -3,39 +3,103 @@
 
 import os
 import sys
-from datetime import datetime
-from urllib.parse import urljoin, urlparse, parse_qs
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlsplit, urlparse, parse_qs
 import re
 import requests
-from bs4 import BeautifulSoup
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selectolax.lexbor import LexborHTMLParser
 from supabase import create_client
 from dotenv import load_dotenv
 
 # Location extraction (name + coordinates + links) from separate helper module
-from extract_locations_from_html import extract_locations
+from extract_locations_from_html import extract_locations, fetch_html as fetch_html_cached
+
+# How many pages we download at the same time
+# Most of the scraping time is spent waiting for the server, so a few parallel
+# downloads make the whole run much faster (but we don't want to overload the website)
+MAX_WORKERS = 8
+
+
+# The website's SSL certificate can't always be verified, so we turn off verification
+# and hide the warning urllib3 would print for every single request
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# One shared session for all downloads (instead of a new one per page)
+# The session keeps connections to the server open, so we only do the TCP/TLS handshake
+# once and reuse it for hundreds of pages. The pool is big enough for our parallel
+# downloads (MAX_WORKERS), and temporary server errors are retried a few times.
+_SESSION = requests.Session()
+_SESSION.verify = False
+_SESSION.headers.update({"User-Agent": "Mozilla/5.0"})
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+    ),
+)
 
 
 # Function to get HTML from a website
+# We use the cached fetch_html from extract_locations_from_html: it remembers the ETag /
+# Last-Modified of every page, so unchanged pages come back as "304 Not Modified"
+# without a body and we read our saved copy from .scraper/.http_cache instead
 def fetch_html(url):
-    import urllib3
-    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-    
-    # Create a session and disable SSL verification (needed for some websites)
-    session = requests.Session()
-    session.verify = False
-    
-    response = session.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=30)
-    response.raise_for_status()
-    return response.text
+    return fetch_html_cached(url, session=_SESSION)
+
+
+# URL prefixes of absolute web links
+# startswith() accepts a tuple, so one call checks both prefixes
+_HTTP = ("http://", "https://")
+
+# Maximum number of values we put into one "in_" filter
+# The values end up in the request URL, so we split long lists to keep the URL short enough
+IN_CHUNK_SIZE = 200
+
+
+# Function to save many rows to a table with as few requests as possible
+# One upsert call per row would mean one HTTP round trip per row (very slow)
+# Instead we send the rows in big chunks: one request for up to chunk_size rows
+def upsert_in_chunks(supabase, table, rows, on_conflict, chunk_size=1000):
+    for i in range(0, len(rows), chunk_size):
+        supabase.table(table).upsert(rows[i:i + chunk_size], on_conflict=on_conflict).execute()
+
+
+# Function to read all rows whose column value is in a (possibly long) list of values
+# The values are sent in chunks of IN_CHUNK_SIZE (they end up in the request URL), and
+# because Supabase returns at most 1000 rows per request, we also page through each chunk
+# order_by must make the order unique, otherwise pages could skip or repeat rows
+def select_in_chunks(supabase, table, columns, column, values, order_by, page_size=1000):
+    rows = []
+    values = list(values)
+    for i in range(0, len(values), IN_CHUNK_SIZE):
+        chunk = values[i:i + IN_CHUNK_SIZE]
+        offset = 0
+        while True:
+            query = supabase.table(table).select(columns).in_(column, chunk)
+            for order_column in order_by:
+                query = query.order(order_column)
+            page = query.range(offset, offset + page_size - 1).execute().data or []
+            rows.extend(page)
+            if len(page) < page_size:
+                break
+            offset += page_size
+    return rows
 
 
 # Function to get all sport offers from the main page
 def extract_offers(source):
     # Offers we don't want to include
-    excluded = ["alle freien Kursplätze dieses Zeitraums"]
+    # (a set, so checking "name in excluded" is a single hash lookup)
+    excluded = {"alle freien Kursplätze dieses Zeitraums"}
     
     # Check if it's a URL or a file path
-    if source.startswith("http://") or source.startswith("https://"):
+    if source.startswith(_HTTP):
         base_url = source
         html = fetch_html(source)
     else:
@@ -43,15 +107,15 @@ def extract_offers(source):
         with open(source, "r", encoding="utf-8") as f:
             html = f.read()
     
-    soup = BeautifulSoup(html, "lxml")
+    tree = LexborHTMLParser(html)
     
     offers = []
     seen_hrefs = set()
     
     # Find all links in the menu
-    for link in soup.select("dl.bs_menu dd a"):
-        name = link.get_text(strip=True)
-        href = link.get("href")
+    for link in tree.css("dl.bs_menu dd a"):
+        name = link.text(strip=True)
+        href = link.attributes.get("href")
         
         if not name or not href:
             continue
@@ -73,70 +137,112 @@ def extract_offers(source):
     return offers
 
 
-# Function to get all courses for one offer
-def extract_courses_for_offer(offer):
+# Function to build a small helper that turns links on one page into full URLs
+# urljoin() parses the base URL again on every call, but all links in a table share the
+# same base. So we split the base URL once here and then only glue strings together.
+# Unusual links (like "../x", "a/./b", "?a=b" or "//host/x") still go through urljoin,
+# because only urljoin resolves "." / ".." path segments correctly.
+def _make_url_joiner(base_url):
+    base_parts = urlsplit(base_url)
+    base_prefix = base_parts.scheme + "://" + base_parts.netloc
+    base_dir = base_prefix + base_parts.path.rsplit("/", 1)[0] + "/"
+    
+    def to_absolute(link):
+        if link.startswith(_HTTP):
+            return link
+        # Dot segments anywhere in the path (e.g. "a/../b.html", "/x/./y") need urljoin
+        if "/." in link:
+            return urljoin(base_url, link)
+        if link.startswith("/") and not link.startswith("//"):
+            return base_prefix + link
+        if link.startswith((".", "?", "#", "/")) or ":" in link:
+            return urljoin(base_url, link)
+        return base_dir + link
+    
+    return to_absolute
+
+
+# Function to get courses AND image/description for one offer
+# Both are on the same offer page, so we download and parse that page only once
+# Returns (courses, metadata)
+def extract_offer_page(offer):
     href = offer["href"]
-    name = offer["name"]
-    
-    if not (href.startswith("http://") or href.startswith("https://")):
-        return []
+    if not href.startswith(_HTTP):
+        return [], {}
     
     html = fetch_html(href)
-    soup = BeautifulSoup(html, "lxml")
+    tree = LexborHTMLParser(html)
+    return _parse_courses(tree, offer), _parse_metadata(tree, offer)
+
+
+# Function to read the course table from an already parsed offer page
+def _parse_courses(tree, offer):
+    href = offer["href"]
+    name = offer["name"]
+    to_absolute = _make_url_joiner(href)
     
     # Find the course table
-    table = soup.select_one("table.bs_kurse")
+    table = tree.css_first("table.bs_kurse")
     if not table:
         return []
     
-    tbody = table.find("tbody")
+    tbody = table.css_first("tbody")
     if not tbody:
         tbody = table
     
     courses = []
     
     # Go through each row in the table
-    for row in tbody.select("tr"):
+    for row in tbody.css("tr"):
+        # Collect the cells of this row once, by their CSS class (like "bs_sknr")
+        # Then every column is a simple dictionary lookup instead of a new CSS search
+        cells_by_class = {}
+        for cell in row.iter():
+            if cell.tag != "td":
+                continue
+            for css_class in (cell.attributes.get("class") or "").split():
+                cells_by_class.setdefault(css_class, cell)
+        
         # Helper function to get text from a cell
-        def get_cell_text(selector):
-            cell = row.select_one(selector)
+        def get_cell_text(css_class):
+            cell = cells_by_class.get(css_class)
             if cell:
-                return cell.get_text(" ", strip=True)
+                return cell.text(separator=" ", strip=True)
             return ""
         
-        kursnr = get_cell_text("td.bs_sknr")
+        kursnr = get_cell_text("bs_sknr")
         if not kursnr:
             continue
         
-        details = get_cell_text("td.bs_sdet")
-        tag = get_cell_text("td.bs_stag")
-        zeit = get_cell_text("td.bs_szeit")
+        details = get_cell_text("bs_sdet")
+        tag = get_cell_text("bs_stag")
+        zeit = get_cell_text("bs_szeit")
         
         # Get location info
-        ort_cell = row.select_one("td.bs_sort")
+        ort_cell = cells_by_class.get("bs_sort")
         ort = ""
         ort_href = None
         if ort_cell:
-            ort = ort_cell.get_text(" ", strip=True)
-            ort_link = ort_cell.select_one("a")
-            if ort_link and ort_link.get("href"):
-                ort_href = urljoin(href, ort_link.get("href"))
+            ort = ort_cell.text(separator=" ", strip=True)
+            ort_link = ort_cell.css_first("a")
+            if ort_link and ort_link.attributes.get("href"):
+                ort_href = to_absolute(ort_link.attributes.get("href"))
         
         # Get link to course dates page
-        zr_cell = row.select_one("td.bs_szr")
+        zr_cell = cells_by_class.get("bs_szr")
         zeitraum_href = None
         if zr_cell:
-            zr_link = zr_cell.select_one("a")
-            if zr_link and zr_link.get("href"):
-                zeitraum_href = urljoin(href, zr_link.get("href"))
+            zr_link = zr_cell.css_first("a")
+            if zr_link and zr_link.attributes.get("href"):
+                zeitraum_href = to_absolute(zr_link.attributes.get("href"))
         
-        leitung = get_cell_text("td.bs_skl")
-        preis = get_cell_text("td.bs_spreis")
+        leitung = get_cell_text("bs_skl")
+        preis = get_cell_text("bs_spreis")
         
-        buch_cell = row.select_one("td.bs_sbuch")
+        buch_cell = cells_by_class.get("bs_sbuch")
         buchung = ""
         if buch_cell:
-            buchung = buch_cell.get_text(" ", strip=True)
+            buchung = buch_cell.text(separator=" ", strip=True)
         
         # Store course data
         # Fields starting with _ are temporary and not saved to database
@@ -155,69 +261,58 @@ def extract_courses_for_offer(offer):
     return courses
 
 
-# Function to get image and description for an offer
-def extract_offer_metadata(offer):
+# Helper to get the next sibling that is a real HTML element
+# (the parser also has nodes for the text and comments between the elements, we skip those)
+def _next_element(node):
+    node = node.next
+    while node is not None and node.tag.startswith("-"):
+        node = node.next
+    return node
+
+
+# Function to read image and description from an already parsed offer page
+def _parse_metadata(tree, offer):
     href = offer["href"]
-    if not (href.startswith("http://") or href.startswith("https://")):
-        return {}
-    
-    html = fetch_html(href)
-    soup = BeautifulSoup(html, "lxml")
     
     result = {}
     
     # Find the title
-    title_element = soup.find("h1")
+    title_element = tree.css_first("h1")
     if not title_element:
-        title_element = soup.find("div", class_="bs_head")
-    
-    # Find image after title
-    if title_element:
-        img_tag = None
-        current = title_element.find_next_sibling()
-        
-        while current and current.name != "table":
-            if current.name == "img":
-                img_tag = current
-                break
-            if hasattr(current, 'find_all'):
-                img = current.find("img")
-                if img and img.get("src"):
-                    img_src = img.get("src")
-                    if "logo" not in img_src.lower() and "icon" not in img_src.lower():
-                        img_tag = img
-                        break
-            current = current.find_next_sibling()
-        
-        if img_tag and img_tag.get("src"):
-            img_src = img_tag.get("src")
-            if "logo" not in img_src.lower() and "icon" not in img_src.lower():
-                result["image_url"] = urljoin(href, img_src)
+        title_element = tree.css_first("div.bs_head")
     
-    # Find description paragraphs
+    # Find the image and the description paragraphs after the title
+    # Both are in the elements between the title and the course table, so we walk
+    # through these elements only once and collect both at the same time
+    img_tag = None
     paragraphs = []
     if title_element:
-        current = title_element
-        while current:
-            current = current.next_sibling
-            
-            if current and hasattr(current, 'name') and current.name == "table":
-                break
+        current = _next_element(title_element)
+        while current and current.tag != "table":
+            # The first image we find is the offer image (logos and icons are skipped)
+            if img_tag is None:
+                if current.tag == "img":
+                    img_tag = current
+                else:
+                    img = current.css_first("img")
+                    if img and img.attributes.get("src"):
+                        img_src = img.attributes.get("src")
+                        if "logo" not in img_src.lower() and "icon" not in img_src.lower():
+                            img_tag = img
             
-            if current and hasattr(current, 'name') and current.name == "p":
-                paragraphs.append(str(current))
+            # css("p") also finds the element itself if it is a <p>
+            # Every <p> is found exactly once here, so each one is only serialized once
+            paragraphs.extend(p.html for p in current.css("p"))
             
-            if current and hasattr(current, 'find_all'):
-                for p in current.find_all("p"):
-                    paragraphs.append(str(p))
-    
-    # Remove duplicates
-    unique_paragraphs = []
-    seen = set()
-    for p in paragraphs:
-        if p not in seen:
-            unique_paragraphs.append(p)
-            seen.add(p)
+            current = _next_element(current)
+    
+    if img_tag and img_tag.attributes.get("src"):
+        img_src = img_tag.attributes.get("src")
+        if "logo" not in img_src.lower() and "icon" not in img_src.lower():
+            result["image_url"] = urljoin(href, img_src)
+    
+    # Remove duplicates (dict.fromkeys keeps the first occurrence and the original order)
+    unique_paragraphs = list(dict.fromkeys(paragraphs))
     
     if unique_paragraphs:
         result["description"] = "\n".join(unique_paragraphs)
@@ -227,17 +322,16 @@ def extract_offer_metadata(offer):
 
 # Function to split trainer names (they are separated by commas)
 def extract_trainer_names(leitung):
-    if not leitung or not leitung.strip():
+    if not leitung:
         return []
     
-    # Split by comma and remove extra spaces
-    names = []
-    for name in leitung.split(","):
-        name = name.strip()
-        if name:
-            names.append(name)
-    
-    return names
+    # Split by comma, remove extra spaces and skip empty names
+    # (an empty or whitespace-only text simply gives an empty list)
+    return [name for name in map(str.strip, leitung.split(",")) if name]
+
+
+# Regular expression for everything that is not a digit (compiled once, used for every course date)
+_NON_DIGITS_RE = re.compile(r"[^0-9]")
 
 
 # Function to parse time ranges like "16:10 - 17:40" or "440-100" into start/end times
@@ -258,7 +352,7 @@ def parse_time_range(zeit_txt):
 
     def parse_part(part):
         # Keep only digits (removes ":" or ".")
-        digits = re.sub(r"[^0-9]", "", part)
+        digits = _NON_DIGITS_RE.sub("", part)
         if len(digits) < 3:
             return None
         # Last two digits are minutes, the rest are hours
@@ -278,38 +372,43 @@ def parse_time_range(zeit_txt):
 # Function to get all dates for a course
 def extract_course_dates(kursnr, zeitraum_href):
     html = fetch_html(zeitraum_href)
-    soup = BeautifulSoup(html, "lxml")
+    tree = LexborHTMLParser(html)
+    to_absolute = _make_url_joiner(zeitraum_href)
     
-    table = soup.select_one("table.bs_kurse")
+    table = tree.css_first("table.bs_kurse")
     if not table:
         return []
     
     dates = []
     
     # Go through each row in the table
-    for row in table.select("tr"):
-        cells = row.find_all("td")
+    for row in table.css("tr"):
+        cells = row.css("td")
         if len(cells) < 4:
             continue
         
         # Get data from cells
-        wochentag = cells[0].get_text(" ", strip=True)
-        datum_raw = cells[1].get_text(" ", strip=True)
-        zeit_txt = cells[2].get_text(" ", strip=True)
+        wochentag = cells[0].text(separator=" ", strip=True)
+        datum_raw = cells[1].text(separator=" ", strip=True)
+        zeit_txt = cells[2].text(separator=" ", strip=True)
         ort_cell = cells[3]
-        ort_txt = ort_cell.get_text(" ", strip=True)
+        ort_txt = ort_cell.text(separator=" ", strip=True)
         
         # Get location link if available
-        ort_link = ort_cell.find("a")
+        ort_link = ort_cell.css_first("a")
         ort_href = None
-        if ort_link and ort_link.get("href"):
-            ort_href = urljoin(zeitraum_href, ort_link.get("href"))
+        if ort_link and ort_link.attributes.get("href"):
+            ort_href = to_absolute(ort_link.attributes.get("href"))
         
         # Convert date to ISO format
+        # The dates always look like "DD.MM.YYYY", so we split them ourselves
+        # (much faster than datetime.strptime). date() still checks that the date exists.
+        parts = datum_raw.split(".")
+        if len(parts) != 3 or len(parts[2]) != 4:
+            continue
         try:
-            date_obj = datetime.strptime(datum_raw, "%d.%m.%Y")
-            datum_iso = date_obj.date().isoformat()
-        except:
+            datum_iso = date(int(parts[2]), int(parts[1]), int(parts[0])).isoformat()
+        except ValueError:
             continue
         
         # Parse time range
@@ -384,9 +483,7 @@ def main():
                         # indoor_outdoor remains optional and can be added later
                     }
                 )
-            supabase.table("unisport_locations").upsert(
-                rows, on_conflict="name"
-            ).execute()
+            upsert_in_chunks(supabase, "unisport_locations", rows, on_conflict="name")
             print("Supabase:", len(rows), "locations saved")
         else:
             # Empty result list is a hard error for the production pipeline,
@@ -401,13 +498,20 @@ def main():
     # =========================================================================
     # STEP 3: Save offers to database
     # =========================================================================
-    supabase.table("sportangebote").upsert(offers, on_conflict="href").execute()
+    upsert_in_chunks(supabase, "sportangebote", offers, on_conflict="href")
     print("Supabase:", len(offers), "offers saved")
     
-    # Get images and descriptions for each offer
-    updated_count = 0
-    for offer in offers:
-        metadata = extract_offer_metadata(offer)
+    # Get courses, images and descriptions for each offer
+    # Each offer page is downloaded and parsed only once (extract_offer_page returns both)
+    # The pages are downloaded in parallel (see MAX_WORKERS); pool.map keeps the order of offers
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        offer_pages = list(pool.map(extract_offer_page, offers))
+    all_metadata = [metadata for _, metadata in offer_pages]
+    # We collect all updates first and save them together (instead of one request per offer)
+    # Rows are grouped by their columns: in a bulk upsert, a column that is missing in one row
+    # would be set to NULL for that row, and we don't want to delete an existing image or description
+    metadata_rows_by_columns = {}
+    for offer, metadata in zip(offers, all_metadata):
         if metadata:
             update_data = {
                 "href": offer["href"],
@@ -417,14 +521,18 @@ def main():
                 update_data["image_url"] = metadata["image_url"]
             if "description" in metadata:
                 update_data["description"] = metadata["description"]
-            supabase.table("sportangebote").upsert(update_data, on_conflict="href").execute()
-            updated_count += 1
+            columns = tuple(update_data.keys())
+            metadata_rows_by_columns.setdefault(columns, []).append(update_data)
+    
+    updated_count = 0
+    for rows in metadata_rows_by_columns.values():
+        upsert_in_chunks(supabase, "sportangebote", rows, on_conflict="href")
+        updated_count += len(rows)
     print("Supabase: Images and descriptions updated for", updated_count, "offers")
     
     # Get all courses for all offers
     all_courses = []
-    for offer in offers:
-        courses = extract_courses_for_offer(offer)
+    for courses, _ in offer_pages:
         all_courses.extend(courses)
     
     # Remove temporary fields (starting with _) before saving
@@ -437,7 +545,7 @@ def main():
         courses_for_db.append(course_clean)
     
     # Save courses to database
-    supabase.table("sportkurse").upsert(courses_for_db, on_conflict="kursnr").execute()
+    upsert_in_chunks(supabase, "sportkurse", courses_for_db, on_conflict="kursnr")
     print("Supabase:", len(courses_for_db), "courses saved")
     
     # Extract trainer names and save them
@@ -460,31 +568,56 @@ def main():
         all_trainers.append({"name": trainer_name})
     
     if all_trainers:
-        supabase.table("trainer").upsert(all_trainers, on_conflict="name").execute()
+        upsert_in_chunks(supabase, "trainer", all_trainers, on_conflict="name")
         print("Supabase:", len(all_trainers), "trainers saved")
     
     # Save course trainer relationships
-    kurs_trainer_rows = []
+    # We store them as (kursnr, trainer_name) pairs in a set, so we can compare them easily
+    desired_pairs = set()
     for trainer_name, kursnrs in trainer_to_courses.items():
         for kursnr in kursnrs:
-            kurs_trainer_rows.append({"kursnr": kursnr, "trainer_name": trainer_name})
-    
-    if kurs_trainer_rows:
-        # Delete old relationships first
-        kursnrs_to_update = []
-        for course in all_courses:
-            kursnrs_to_update.append(course["kursnr"])
-        for kursnr in kursnrs_to_update:
-            supabase.table("kurs_trainer").delete().eq("kursnr", kursnr).execute()
+            desired_pairs.add((kursnr, trainer_name))
+    
+    if desired_pairs:
+        # Load the relationships that are already in the database for our courses
+        kursnrs_to_update = {course["kursnr"] for course in all_courses}
+        existing_rows = select_in_chunks(
+            supabase, "kurs_trainer", "kursnr, trainer_name",
+            "kursnr", kursnrs_to_update, order_by=("kursnr", "trainer_name"),
+        )
+        existing_pairs = {(r["kursnr"], r["trainer_name"]) for r in existing_rows}
+        
+        # Only change what is different (instead of deleting everything and inserting it again)
+        to_add = desired_pairs - existing_pairs
+        to_remove = existing_pairs - desired_pairs
+        
+        # Delete removed relationships: one request per trainer (and chunk of courses)
+        removed_by_trainer = {}
+        for kursnr, trainer_name in to_remove:
+            removed_by_trainer.setdefault(trainer_name, []).append(kursnr)
+        for trainer_name, kursnrs in removed_by_trainer.items():
+            for i in range(0, len(kursnrs), IN_CHUNK_SIZE):
+                chunk = kursnrs[i:i + IN_CHUNK_SIZE]
+                supabase.table("kurs_trainer").delete().eq("trainer_name", trainer_name).in_("kursnr", chunk).execute()
+        
         # Insert new relationships
-        supabase.table("kurs_trainer").insert(kurs_trainer_rows).execute()
-        print("Supabase:", len(kurs_trainer_rows), "course-trainer relationships saved")
+        rows_to_add = [{"kursnr": kursnr, "trainer_name": trainer_name} for kursnr, trainer_name in to_add]
+        upsert_in_chunks(supabase, "kurs_trainer", rows_to_add, on_conflict="kursnr,trainer_name")
+        print("Supabase:", len(desired_pairs), "course-trainer relationships saved",
+              "(" + str(len(to_add)), "added,", len(to_remove), "removed)")
     
     # Get all course dates
     all_dates = []
-    for course in all_courses:
-        if course.get("zeitraum_href") and course.get("kursnr"):
-            dates = extract_course_dates(course["kursnr"], course["zeitraum_href"])
+    courses_with_dates = [
+        course for course in all_courses
+        if course.get("zeitraum_href") and course.get("kursnr")
+    ]
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        for dates in pool.map(
+            extract_course_dates,
+            [course["kursnr"] for course in courses_with_dates],
+            [course["zeitraum_href"] for course in courses_with_dates],
+        ):
             all_dates.extend(dates)
     
     if all_dates:
@@ -498,13 +631,10 @@ def main():
                     valid_names.add(name.strip())
         
         # Set invalid location names to None
+        # extract_course_dates() already gives us stripped names (or None), so no strip() needed here
         for row in all_dates:
             ln = row.get("location_name")
-            if ln:
-                ln = ln.strip()
-                if ln not in valid_names:
-                    row["location_name"] = None
-            else:
+            if not ln or ln not in valid_names:
                 row["location_name"] = None
         
         # Load existing canceled status
@@ -513,12 +643,14 @@ def main():
         for row in all_dates:
             kursnrs_set.add(row["kursnr"])
         
-        for kursnr in kursnrs_set:
-            resp = supabase.table("kurs_termine").select("kursnr, start_time, canceled").eq("kursnr", kursnr).execute()
-            if resp.data:
-                for term in resp.data:
-                    key = (term["kursnr"], term["start_time"])
-                    existing_canceled[key] = term.get("canceled", False)
+        # One query per chunk of course numbers instead of one per course
+        existing_terms = select_in_chunks(
+            supabase, "kurs_termine", "kursnr, start_time, canceled",
+            "kursnr", kursnrs_set, order_by=("kursnr", "start_time"),
+        )
+        for term in existing_terms:
+            key = (term["kursnr"], term["start_time"])
+            existing_canceled[key] = term.get("canceled", False)
         
         # Set canceled status
         for row in all_dates:
@@ -529,7 +661,7 @@ def main():
                 row["canceled"] = False
         
         # Save dates to database
-        supabase.table("kurs_termine").upsert(all_dates, on_conflict="kursnr,start_time").execute()
+        upsert_in_chunks(supabase, "kurs_termine", all_dates, on_conflict="kursnr,start_time")
         print("Supabase:", len(all_dates), "dates saved")
     else:
         print("Note: No dates found")
@@ -10,6 +10,13 @@ from supabase import create_client
 from dotenv import load_dotenv
 
 
+# Regular expressions (compiled once when the script starts, not on every call)
+# Cancellation notices look like "DD.MM.YYYY, Name, HH:MM"
+_CANCELLATION_RE = re.compile(r"(\d{2}\.\d{2}\.\d{4})\s*,\s*([^,]+?)\s*,\s*(\d{1,2}[:\.]\d{2})")
+# Everything that is not a digit
+_NON_DIGITS_RE = re.compile(r"[^0-9]")
+
+
 # Function to get HTML from a website
 def fetch_html(url):
     response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=30)
@@ -29,10 +36,8 @@ def parse_cancellations():
     text = soup.get_text(" ", strip=True)
     
     # Find patterns like "DD.MM.YYYY, Name, HH:MM"
-    pattern = re.compile(r"(\d{2}\.\d{2}\.\d{4})\s*,\s*([^,]+?)\s*,\s*(\d{1,2}[:\.]\d{2})")
-    
     cancellations = []
-    for match in pattern.finditer(text):
+    for match in _CANCELLATION_RE.finditer(text):
         date_raw = match.group(1)
         name = match.group(2).strip()
         time_raw = match.group(3).strip()
@@ -45,7 +50,7 @@ def parse_cancellations():
             continue
         
         # Extract time digits (remove colons/dots)
-        time_digits = re.sub(r"[^0-9]", "", time_raw)
+        time_digits = _NON_DIGITS_RE.sub("", time_raw)
         if len(time_digits) >= 3:
             # Convert to HHMM format (e.g., "18:15" becomes 1815)
             start_hhmm = int(time_digits[:2] + time_digits[2:4])
@@ -64,7 +69,7 @@ def extract_start_hhmm(zeit_txt):
     start_part = parts[0].strip()
     
     # Remove all non-digits
-    digits = re.sub(r"[^0-9]", "", start_part)
+    digits = _NON_DIGITS_RE.sub("", start_part)
     
     if len(digits) >= 3:
         return int(digits[:2] + digits[2:4])
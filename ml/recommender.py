@@ -23,6 +23,7 @@ import numpy as np
 from sklearn.neighbors import NearestNeighbors
 from sklearn.preprocessing import StandardScaler
 import joblib
+import pickle
 from typing import List, Dict
 
 # =============================================================================
@@ -158,8 +159,12 @@ class KNNSportRecommender:
             raise ValueError("Model not trained. Call load_and_train() first.")
         
         # Build user feature vector from preferences dict
-        user_vector = np.array([user_preferences.get(col, 0.0) for col in FEATURE_COLUMNS])
-        user_vector = user_vector.reshape(1, -1)
+        # (filled straight into a 1 x 13 array, no temporary Python list)
+        user_vector = np.fromiter(
+            (user_preferences.get(col, 0.0) for col in FEATURE_COLUMNS),
+            dtype=np.float64,
+            count=len(FEATURE_COLUMNS)
+        ).reshape(1, -1)
         
         # Apply same scaling transformation used during training
         user_vector_scaled = self.scaler.transform(user_vector)
@@ -203,6 +208,10 @@ class KNNSportRecommender:
             - sports_df: Training DataFrame with all sports
             - feature_columns: List of feature column names
             - n_neighbors: Number of neighbors used
+            
+            The bundle is written with the newest pickle protocol (faster to
+            load, NumPy arrays are stored as raw buffers) and zlib level 3
+            compression (smaller file). joblib.load() reads both transparently.
         """
         if not self.is_fitted:
             raise ValueError("Model not trained. Call load_and_train() first.")
@@ -214,7 +223,7 @@ class KNNSportRecommender:
             'sports_df': self.sports_df,
             'feature_columns': FEATURE_COLUMNS,
             'n_neighbors': self.n_neighbors
-        }, path)
+        }, path, compress=3, protocol=pickle.HIGHEST_PROTOCOL)
         print(f"Saved KNN model to {path}")
     
     @staticmethod
@@ -48,6 +48,7 @@ from utils.auth import (
 # Filtering functions
 from utils.filters import (
     filter_events,
+    get_activity_filter_options,
     get_filter_values_from_session,
     has_event_filters,
     initialize_session_state
@@ -58,7 +59,8 @@ from utils.formatting import (
     create_offer_metadata_df,
     get_match_score_style,
     render_user_avatar,
-    convert_events_to_table_data
+    convert_events_to_table_data,
+    WEEKDAY_NAMES
 )
 
 # Analytics functions
@@ -70,7 +72,9 @@ from utils.analytics import (
 # Database functions
 from utils.db import (
     get_user_complete,
+    get_offers_complete,
     get_events_grouped_by_offer,
+    get_event_filter_options,
     load_and_filter_offers,
     load_and_filter_events
 )
@@ -90,6 +94,61 @@ st.set_page_config(
 )
 
 
+# =============================================================================
+# STATIC PAGE CONTENT
+# =============================================================================
+# PURPOSE: Text and team data for the About tab
+# WHY: This content never changes, so it is built once when the module is
+#     loaded instead of on every rerun
+
+# WHY: Path to team images relative to current file
+# HOW: Use Path(__file__) to get absolute path to current file
+# .parent goes up one directory, then / "assets" / "images"
+_ASSETS_PATH = Path(__file__).resolve().parent / "assets" / "images"
+_TEAM_MEMBERS = [
+    {"name": "Tamara Nessler", "url": "https://www.linkedin.com/in/tamaranessler/", "avatar": str(_ASSETS_PATH / "tamara.jpeg")},
+    {"name": "Till Banerjee", "url": "https://www.linkedin.com/in/till-banerjee/", "avatar": str(_ASSETS_PATH / "till.jpeg")},
+    {"name": "Sarah Bugg", "url": "https://www.linkedin.com/in/sarah-bugg/", "avatar": str(_ASSETS_PATH / "sarah.jpeg")},
+    {"name": "Antonia Büttiker", "url": "https://www.linkedin.com/in/antonia-büttiker-895713254/", "avatar": str(_ASSETS_PATH / "antonia.jpeg")},
+    {"name": "Luca Hagenmayer", "url": "https://www.linkedin.com/in/lucahagenmayer/", "avatar": str(_ASSETS_PATH / "luca.jpeg")},
+]
+
+_ABOUT_HOW_IT_WORKS_MD = """
+**What's happening behind the scenes?**
+
+1. **Automated Data Collection:** Python scripts automatically scrape Unisport websites 
+   (offers, courses, dates, locations) via GitHub Actions on a regular schedule.
+
+2. **Data Storage:** All data is stored in Supabase, our hosted PostgreSQL database.
+
+3. **Real-time Display:** This Streamlit app loads data directly from Supabase and 
+   displays it here in real-time.
+
+4. **Smart Features:** AI-powered recommendations using Machine Learning (KNN algorithm), 
+   advanced filtering system.
+
+**Tech Stack:**
+- **Frontend:** Streamlit (Python web framework)
+- **Database:** Supabase (PostgreSQL)
+- **ML:** scikit-learn (KNN recommender)
+- **Visualization:** Plotly (interactive charts)
+- **Authentication:** Google OAuth via Streamlit
+"""
+
+_ABOUT_BACKGROUND_MD = """
+This project was created for the course **"Fundamentals and Methods of Computer Science"** 
+at the University of St.Gallen, taught by:
+- [Prof. Dr. Stephan Aier](https://www.unisg.ch/de/universitaet/ueber-uns/organisation/detail/person-id/32344c07-5d2e-41f0-9ba8-d9f379bb05ee/)
+- [Dr. Bernhard Bermeitinger](https://www.unisg.ch/de/universitaet/ueber-uns/organisation/detail/person-id/1fa3d0cd-cb80-410a-b2b4-dbc3f1a4ee27/)
+- [Prof. Dr. Simon Mayer](https://www.unisg.ch/de/universitaet/ueber-uns/organisation/detail/person-id/b7d5efc7-55f2-4b97-9e31-ac097b6d15e1/)
+
+**Status:** Still in development and not yet reviewed by professors.
+
+**Feedback?** Have feature requests or found bugs? Please contact one of the team members 
+via LinkedIn (see above).
+"""
+
+
 # =============================================================================
 # SESSION STATE INITIALIZATION
 # =============================================================================
@@ -103,7 +162,8 @@ st.set_page_config(
 # Database queries can fail, therefore try/except
 # On error: Return empty list (graceful degradation)
 if 'sports_data' not in st.session_state:
-    from utils.db import get_offers_complete
+    # Filter options are derived from sports_data, so rebuild them with it
+    st.session_state.pop('activity_filter_options', None)
     try:
         st.session_state['sports_data'] = get_offers_complete()
     except Exception:
@@ -117,9 +177,9 @@ sports_data = st.session_state.get('sports_data', [])
 # WHY: Grouping enables fast lookup by offer_href
 # HOW: Dictionary with offer_href as key, list of events as value
 events_by_offer = get_events_grouped_by_offer()
-# Extract all events for sidebar filters
-# HOW: Flat list of all events from all groups for filter dropdowns
-events = [e for events_list in events_by_offer.values() for e in events_list]
+# Sport and location options for the sidebar filters
+# HOW: Collected from all events once per cache period (see get_event_filter_options)
+sport_names, locations = get_event_filter_options()
 
 # =============================================================================
 # UNIFIED SIDEBAR (Rendered once at module level)
@@ -191,12 +251,6 @@ with st.sidebar:
         # =================================================================
         # SPORT FILTER
         # =================================================================
-        sport_names = sorted(set([
-            e.get('sport_name', '') 
-            for e in events 
-            if e.get('sport_name')
-        ]))
-        
         # WHY: If user comes from "View Details", the corresponding sport should be pre-selected
         # HOW: Check if selected_offer exists in session_state and set as default
         default_sports = []
@@ -222,27 +276,12 @@ with st.sidebar:
         # ACTIVITY FILTERS
         # =================================================================
         with st.expander("🎯 Activity Type", expanded=True):
-                intensities = sorted(set([
-                    item.get('intensity') 
-                    for item in sports_data 
-                    if item.get('intensity')
-                ]))
-                
-                # WHY: focus and setting are lists in the data, must be extracted to sets
-                # HOW: Iterate over all items, collect all values in sets (prevents duplicates)
-                all_focuses = set()
-                for item in sports_data:
-                    if item.get('focus'):
-                        # focus is a list, therefore update() instead of add()
-                        all_focuses.update(item.get('focus'))
-                focuses = sorted(list(all_focuses))
-                
-                all_settings = set()
-                for item in sports_data:
-                    if item.get('setting'):
-                        # setting is a list, therefore update() instead of add()
-                        all_settings.update(item.get('setting'))
-                settings = sorted(list(all_settings))
+                # WHY: sports_data only changes when it is reloaded into session_state,
+                #     so the dropdown options are computed once and kept next to it
+                # HOW: One pass over sports_data (see get_activity_filter_options)
+                if 'activity_filter_options' not in st.session_state:
+                    st.session_state['activity_filter_options'] = get_activity_filter_options(sports_data)
+                intensities, focuses, settings = st.session_state['activity_filter_options']
                 
                 if intensities:
                     selected_intensity = st.multiselect(
@@ -287,12 +326,6 @@ with st.sidebar:
         # COURSE FILTERS
         # =================================================================
         with st.expander("📍 Location & Day", expanded=False):
-                locations = sorted(set([
-                    e.get('location_name', '') 
-                    for e in events 
-                    if e.get('location_name')
-                ]))
-                
                 selected_locations = st.multiselect(
                     "📍 Location",
                     options=locations,
@@ -304,12 +337,9 @@ with st.sidebar:
                 
                 st.markdown("")
                 
-                weekday_options = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 
-                                  'Friday', 'Saturday', 'Sunday']
-                
                 selected_weekdays = st.multiselect(
                     "📆 Weekday",
-                    options=weekday_options,
+                    options=WEEKDAY_NAMES,
                     default=st.session_state.get('weekday', []),
                     key="unified_weekday",
                     help="Filter by day of the week"
@@ -388,6 +418,15 @@ with st.sidebar:
 # PURPOSE: Initialize filter-related session state variables with defaults
 initialize_session_state()
 
+# =============================================================================
+# FILTER SNAPSHOT
+# =============================================================================
+# PURPOSE: Read all filter values from session state once per rerun
+# WHY: Only the sidebar changes filters, and it has already run at this point
+# HOW: Analytics and all tabs share this one dictionary instead of each
+#     reading every filter key from session_state again
+filters = get_filter_values_from_session()
+
 # =============================================================================
 # AUTHENTICATION CHECK
 # =============================================================================
@@ -417,7 +456,7 @@ if is_logged_in():
 # Ensures About tab always remains accessible
 try:
     with st.expander("Analytics", expanded=True):
-        render_analytics_section()
+        render_analytics_section(filters=filters)
 except Exception as e:
     # On analytics error: Skip section, but app continues running
     # Important: About tab remains always accessible, even with DB problems
@@ -446,14 +485,11 @@ tab_overview, tab_details, tab_profile, tab_about = st.tabs([
 
 with tab_overview:
     # =========================================================================
-    # GET FILTER VALUES FROM SESSION STATE
+    # GET FILTER VALUES
     # =========================================================================
-    # PURPOSE: Extract filter values from session state
+    # PURPOSE: Use the filter snapshot taken after the sidebar was rendered
     # WHY: Session state persists filter values across tab switches and reruns
-    # HOW: Function reads all filters from session_state and returns dictionary
     # Ensures filters are consistent across all tabs
-    filters = get_filter_values_from_session()
-    
     selected_offers_filter = filters['selected_sports']
     hide_cancelled = filters['hide_cancelled']
     
@@ -481,15 +517,14 @@ with tab_overview:
     # PURPOSE: Display filtered offers with events
     if offers:
         for offer in offers:
-            # WHY: Use same function as Course Dates tab for consistency
-            # HOW: Load events with load_and_filter_events, apply all active filters
+            # WHY: Use the same filter logic as Course Dates tab for consistency
+            # HOW: Look up the offer's events in events_by_offer (all events, loaded
+            #     once above) and apply all active filters with filter_events
             # Ensures events are filtered consistently (e.g. hide_cancelled)
-            # show_spinner=False: No spinner in overview, as many offers are loaded
+            # Avoids one database query per offer in this loop
             offer_href = offer.get('href')
             if offer_href:
-                # Use the same filtering logic as Course Dates tab
-                # Cached for 60 seconds, as events can change more frequently
-                upcoming_events = load_and_filter_events(filters=filters, offer_href=offer_href, show_spinner=False)
+                upcoming_events = filter_events(events_by_offer.get(offer_href, []), filters=filters)
             else:
                 # Edge Case: Offer has no href (should not occur, but safety check)
                 upcoming_events = []
@@ -655,14 +690,6 @@ with tab_details:
             st.link_button("🔗 Book this course", offer_href, use_container_width=True)
             st.markdown("")
     
-    # =========================================================================
-    # GET FILTER STATES
-    # =========================================================================
-    # PURPOSE: Extract filter values from session state
-    # WHY: Filters are set in sidebar, must be read here
-    # HOW: Function reads all filters from session_state and returns dictionary
-    filters = get_filter_values_from_session()
-    
     # =========================================================================
     # LOAD AND FILTER EVENTS
     # =========================================================================
@@ -778,65 +805,22 @@ with tab_about:
     
     with col_left:
         st.subheader("How This App Works")
-        st.markdown("""
-        **What's happening behind the scenes?**
-        
-        1. **Automated Data Collection:** Python scripts automatically scrape Unisport websites 
-           (offers, courses, dates, locations) via GitHub Actions on a regular schedule.
-        
-        2. **Data Storage:** All data is stored in Supabase, our hosted PostgreSQL database.
-        
-        3. **Real-time Display:** This Streamlit app loads data directly from Supabase and 
-           displays it here in real-time.
-        
-        4. **Smart Features:** AI-powered recommendations using Machine Learning (KNN algorithm), 
-           advanced filtering system.
-        
-        **Tech Stack:**
-        - **Frontend:** Streamlit (Python web framework)
-        - **Database:** Supabase (PostgreSQL)
-        - **ML:** scikit-learn (KNN recommender)
-        - **Visualization:** Plotly (interactive charts)
-        - **Authentication:** Google OAuth via Streamlit
-        """)
+        st.markdown(_ABOUT_HOW_IT_WORKS_MD)
     
     with col_right:
         st.subheader("Project Team")
         
-        # WHY: Path to team images relative to current file
-        # HOW: Use Path(__file__) to get absolute path to current file
-        # .parent goes up one directory, then / "assets" / "images"
-        assets_path = Path(__file__).resolve().parent / "assets" / "images"
-        team_members = [
-            {"name": "Tamara Nessler", "url": "https://www.linkedin.com/in/tamaranessler/", "avatar": str(assets_path / "tamara.jpeg")},
-            {"name": "Till Banerjee", "url": "https://www.linkedin.com/in/till-banerjee/", "avatar": str(assets_path / "till.jpeg")},
-            {"name": "Sarah Bugg", "url": "https://www.linkedin.com/in/sarah-bugg/", "avatar": str(assets_path / "sarah.jpeg")},
-            {"name": "Antonia Büttiker", "url": "https://www.linkedin.com/in/antonia-büttiker-895713254/", "avatar": str(assets_path / "antonia.jpeg")},
-            {"name": "Luca Hagenmayer", "url": "https://www.linkedin.com/in/lucahagenmayer/", "avatar": str(assets_path / "luca.jpeg")},
-        ]
-        
         cols = st.columns(5)
-        for idx, member in enumerate(team_members):
+        for idx, member in enumerate(_TEAM_MEMBERS):
             with cols[idx]:
                 st.image(member["avatar"], width=180)
                 st.markdown(f"[{member['name']}]({member['url']})")
         
-        render_team_contribution_matrix(team_members, assets_path)
+        render_team_contribution_matrix(_TEAM_MEMBERS, _ASSETS_PATH)
     
     st.divider()
     st.subheader("Project Background")
-    st.markdown("""
-    This project was created for the course **"Fundamentals and Methods of Computer Science"** 
-    at the University of St.Gallen, taught by:
-    - [Prof. Dr. Stephan Aier](https://www.unisg.ch/de/universitaet/ueber-uns/organisation/detail/person-id/32344c07-5d2e-41f0-9ba8-d9f379bb05ee/)
-    - [Dr. Bernhard Bermeitinger](https://www.unisg.ch/de/universitaet/ueber-uns/organisation/detail/person-id/1fa3d0cd-cb80-410a-b2b4-dbc3f1a4ee27/)
-    - [Prof. Dr. Simon Mayer](https://www.unisg.ch/de/universitaet/ueber-uns/organisation/detail/person-id/b7d5efc7-55f2-4b97-9e31-ac097b6d15e1/)
-    
-    **Status:** Still in development and not yet reviewed by professors.
-    
-    **Feedback?** Have feature requests or found bugs? Please contact one of the team members 
-    via LinkedIn (see above).
-    """)
+    st.markdown(_ABOUT_BACKGROUND_MD)
 
 
 # Parts of this codebase were developed with the assistance of AI-based tools (Cursor and Github Copilot)
@@ -14,18 +14,55 @@ import plotly.graph_objects as go
 from utils.db import (
     get_events_by_weekday,
     get_events_by_hour,
-    load_and_filter_offers
+    load_and_filter_offers,
+    load_and_filter_events
 )
 from utils.filters import get_filter_values_from_session, get_merged_recommendations, has_offer_filters
 from utils.ml_utils import load_knn_model
 from pathlib import Path
 
+# =============================================================================
+# CHART STYLE CONSTANTS
+# =============================================================================
+# PURPOSE: Shared Plotly styling, built once at import instead of on every rerun
+
+_GRID_COLOR = 'rgba(108, 117, 125, 0.1)'
+_TITLE_FONT = dict(size=18, family='Arial', color='#000000')
+_AVAILABILITY_LAYOUT = dict(
+    height=300,
+    margin=dict(l=20, r=20, t=50, b=20),
+    paper_bgcolor='#FFFFFF',
+    plot_bgcolor='rgba(0,0,0,0)',
+    font=dict(family='Inter, system-ui, sans-serif', size=12),
+    yaxis=dict(gridcolor=_GRID_COLOR, showgrid=True),
+    # Hover only the bar under the cursor (no unified x hover across all traces)
+    hovermode='closest'
+)
+# Warm gradient for match scores: red -> orange -> teal
+_MATCH_SCORE_COLORSCALE = [[0, '#D62828'], [0.5, '#FCBF49'], [1, '#06A77D']]
+# Feature tags shown on the podest: (offer key, label)
+_PODEST_FOCUS_TAGS = (
+    ('balance', 'Balance'),
+    ('flexibility', 'Flexibility'),
+    ('strength', 'Strength'),
+    ('endurance', 'Endurance'),
+)
+_PODEST_SETTING_TAGS = (('team', 'Team'), ('solo', 'Solo'))
+# Feature tags shown in the recommendation chart tooltips
+_TOOLTIP_FOCUS_TAGS = ('balance', 'flexibility', 'coordination', 'relaxation', 'strength', 'endurance', 'longevity')
+_TOOLTIP_SETTING_TAGS = ('team', 'fun', 'duo', 'solo', 'competitive')
+# Longest bar label (in characters) before it is cut with "..."
+_MAX_LABEL_LENGTH = 30
+# Hour range (inclusive) shown in the time of day chart and its axis labels
+_CHART_HOURS = range(6, 23)
+_CHART_HOUR_LABELS = [f"{h:02d}:00" for h in _CHART_HOURS]
+
 # =============================================================================
 # ANALYTICS VISUALIZATIONS
 # =============================================================================
 # PURPOSE: Functions for rendering analytics charts and recommendations
 
-def render_analytics_section():
+def render_analytics_section(filters=None):
     """Render analytics visualizations with AI recommendations and charts.
     
     Displays:
@@ -33,17 +70,27 @@ def render_analytics_section():
     - Course availability by weekday (Bar chart)
     - Course availability by time of day (Histogram)
     
+    Args:
+        filters (dict, optional): Filters dict from get_filter_values_from_session().
+            If None, the filter values are read from session state.
+    
     Note:
         This function reads filter values from session state and displays
         recommendations only if offer filters (focus/intensity/setting) are set.
         Chart configurations use Plotly with custom styling for consistent appearance.
     """
     # Get filter state from session_state for AI recommendations
-    filters = get_filter_values_from_session()
+    if filters is None:
+        filters = get_filter_values_from_session()
     selected_focus = filters['focus']
     selected_intensity = filters['intensity']
     selected_setting = filters['setting']
     
+    # Lowercase the selections once, so the checks below are set lookups
+    selected_focus_lower = {f.lower() for f in (selected_focus or [])}
+    selected_intensity_lower = {i.lower() for i in (selected_intensity or [])}
+    selected_setting_lower = {s.lower() for s in (selected_setting or [])}
+    
     # Check if any ML-relevant filters are selected
     has_filters = has_offer_filters(filters=filters)
     
@@ -76,16 +123,11 @@ def render_analytics_section():
                 )
             ])
             fig.update_layout(
-                title=dict(text="Course Availability by Weekday", x=0.5, xanchor='center', font=dict(size=18, family='Arial', color='#000000')),
+                title=dict(text="Course Availability by Weekday", x=0.5, xanchor='center', font=_TITLE_FONT),
                 xaxis_title="Weekday",
                 yaxis_title="Number of Courses",
-                height=300,
-                margin=dict(l=20, r=20, t=50, b=20),
-                paper_bgcolor='#FFFFFF',
-                plot_bgcolor='rgba(0,0,0,0)',
-                font=dict(family='Inter, system-ui, sans-serif', size=12),
-                xaxis=dict(gridcolor='rgba(108, 117, 125, 0.1)', showgrid=True),
-                yaxis=dict(gridcolor='rgba(108, 117, 125, 0.1)', showgrid=True)
+                xaxis=dict(gridcolor=_GRID_COLOR, showgrid=True),
+                **_AVAILABILITY_LAYOUT
             )
             st.plotly_chart(fig, width="stretch")
     
@@ -93,37 +135,29 @@ def render_analytics_section():
         # 2. Kursverfügbarkeit nach Tageszeit
         if hour_data:
             # Filter: Nur Stunden zwischen 6 und 22 Uhr
-            filtered_hours = {h: hour_data.get(h, 0) for h in range(6, 23)}
-            
-            # Formatierung: Stunden als "06:00", "07:00", etc.
-            hours_formatted = [f"{h:02d}:00" for h in range(6, 23)]
-            counts = [filtered_hours[h] for h in range(6, 23)]
+            # Formatierung: Stunden als "06:00", "07:00", etc. (_CHART_HOUR_LABELS)
+            counts = [hour_data.get(h, 0) for h in _CHART_HOURS]
             
             fig = go.Figure(data=[
                 go.Bar(
-                    x=hours_formatted,
+                    x=_CHART_HOUR_LABELS,
                     y=counts,
                     marker_color='#F77F00',
                 )
             ])
             fig.update_layout(
-                title=dict(text="Course Availability by Time of Day", x=0.5, xanchor='center', font=dict(size=18, family='Arial', color='#000000')),
+                title=dict(text="Course Availability by Time of Day", x=0.5, xanchor='center', font=_TITLE_FONT),
                 xaxis_title="Time",
                 yaxis_title="Number of Courses",
-                height=300,
-                margin=dict(l=20, r=20, t=50, b=20),
-                paper_bgcolor='#FFFFFF',
-                plot_bgcolor='rgba(0,0,0,0)',
-                font=dict(family='Inter, system-ui, sans-serif', size=12),
                 xaxis=dict(
                     tickmode='linear',
                     tick0=0,
                     dtick=2,
-                    gridcolor='rgba(108, 117, 125, 0.1)',
+                    gridcolor=_GRID_COLOR,
                     showgrid=True,
                     tickangle=-45
                 ),
-                yaxis=dict(gridcolor='rgba(108, 117, 125, 0.1)', showgrid=True)
+                **_AVAILABILITY_LAYOUT
             )
             st.plotly_chart(fig, width="stretch")
     
@@ -165,22 +199,19 @@ def render_analytics_section():
                 # If sport filter is active, only show recommendations that have events for selected sports
                 selected_sports = filters.get('selected_sports', [])
                 if selected_sports and len(selected_sports) > 0:
-                    from utils.db import load_and_filter_events
+                    # Load the events for the selected sports once and collect the offers
+                    # that have any, instead of one filtered load per recommendation
+                    sport_events = load_and_filter_events(
+                        filters={'selected_sports': selected_sports},
+                        show_spinner=False
+                    )
+                    hrefs_with_events = {event.get('offer_href') for event in sport_events}
                     filtered_recommendations = []
                     for rec in all_recommendations:
                         offer = rec.get('offer', {})
                         offer_href = offer.get('href')
-                        if offer_href:
-                            # Check if this offer has events for the selected sports
-                            events = load_and_filter_events(
-                                filters={'selected_sports': selected_sports}, 
-                                offer_href=offer_href, 
-                                show_spinner=False
-                            )
-                            if events:
-                                filtered_recommendations.append(rec)
-                        else:
-                            # If no href, include it (shouldn't happen, but be safe)
+                        # If no href, include it (shouldn't happen, but be safe)
+                        if not offer_href or offer_href in hrefs_with_events:
                             filtered_recommendations.append(rec)
                     all_recommendations = filtered_recommendations
                 
@@ -188,9 +219,9 @@ def render_analytics_section():
                 top3_combined = all_recommendations[:3]
                 
                 # Get next 10 for graph (excluding top 3)
-                top3_names = {item['name'] for item in top3_combined}
-                chart_data_filtered = [item for item in all_recommendations if item['name'] not in top3_names]
-                chart_data_top10 = chart_data_filtered[:10]
+                # Names are unique and the list is already sorted by score, so the
+                # next 10 are simply the following slice - no need to scan the whole list
+                chart_data_top10 = all_recommendations[3:13]
                 
                 # Calculate average score for chart (using top 10)
                 if chart_data_top10:
@@ -231,67 +262,15 @@ def render_analytics_section():
                                 quality_color = "#D62828"  # Warm red
                             
                             # Get additional features not in user's selection (simplified)
-                            additional_focus = []
-                            # Check if balance is not in selected focus
-                            balance_in_selected = False
-                            if selected_focus:
-                                for f in selected_focus:
-                                    if f.lower() == 'balance':
-                                        balance_in_selected = True
-                                        break
-                            if offer.get('balance') and not balance_in_selected:
-                                additional_focus.append('Balance')
-                            
-                            # Check if flexibility is not in selected focus
-                            flexibility_in_selected = False
-                            if selected_focus:
-                                for f in selected_focus:
-                                    if f.lower() == 'flexibility':
-                                        flexibility_in_selected = True
-                                        break
-                            if offer.get('flexibility') and not flexibility_in_selected:
-                                additional_focus.append('Flexibility')
-                            
-                            # Check if strength is not in selected focus
-                            strength_in_selected = False
-                            if selected_focus:
-                                for f in selected_focus:
-                                    if f.lower() == 'strength':
-                                        strength_in_selected = True
-                                        break
-                            if offer.get('strength') and not strength_in_selected:
-                                additional_focus.append('Strength')
-                            
-                            # Check if endurance is not in selected focus
-                            endurance_in_selected = False
-                            if selected_focus:
-                                for f in selected_focus:
-                                    if f.lower() == 'endurance':
-                                        endurance_in_selected = True
-                                        break
-                            if offer.get('endurance') and not endurance_in_selected:
-                                additional_focus.append('Endurance')
+                            additional_focus = [
+                                label for key, label in _PODEST_FOCUS_TAGS
+                                if offer.get(key) and key not in selected_focus_lower
+                            ]
                             
-                            additional_setting = []
-                            # Check if team is not in selected setting
-                            team_in_selected = False
-                            if selected_setting:
-                                for s in selected_setting:
-                                    if s.lower() == 'team':
-                                        team_in_selected = True
-                                        break
-                            if offer.get('setting_team') and not team_in_selected:
-                                additional_setting.append('Team')
-                            
-                            # Check if solo is not in selected setting
-                            solo_in_selected = False
-                            if selected_setting:
-                                for s in selected_setting:
-                                    if s.lower() == 'solo':
-                                        solo_in_selected = True
-                                        break
-                            if offer.get('setting_solo') and not solo_in_selected:
-                                additional_setting.append('Solo')
+                            additional_setting = [
+                                label for key, label in _PODEST_SETTING_TAGS
+                                if offer.get(f'setting_{key}') and key not in selected_setting_lower
+                            ]
                             
                             # Build compact features text
                             features_parts = []
@@ -316,12 +295,9 @@ def render_analytics_section():
                     if not chart_data_top10:
                         st.info("Die Top 3 Empfehlungen werden links angezeigt. Es gibt keine weiteren Empfehlungen für das Diagramm.")
                     else:
-                        # Prepare data for chart (top 10)
-                        sport_names = []
-                        match_scores = []
-                        for d in chart_data_top10:
-                            sport_names.append(d['name'])
-                            match_scores.append(d['match_score'])
+                        # Prepare data for chart (top 10) in one pass
+                        sport_names = [d['name'] for d in chart_data_top10]
+                        match_scores = [d['match_score'] for d in chart_data_top10]
                         
                         # Ensure valid data is available
                         has_sport_names = bool(sport_names)
@@ -330,96 +306,14 @@ def render_analytics_section():
                         if not has_sport_names or not has_match_scores or not lengths_match:
                             st.warning("Data mismatch in chart data.")
                         else:
-                            # Build hover tooltips with additional features
-                            hover_texts = []
-                            for chart_item in chart_data_top10:
-                                offer = chart_item['offer']
-                                sport_name = chart_item['name']
-                                match_score = chart_item['match_score']
-                                
-                                # Get additional focus tags not in user's selection
-                                additional_focus = []
-                                focus_map = {
-                                    'balance': 'Balance',
-                                    'flexibility': 'Flexibility',
-                                    'coordination': 'Coordination',
-                                    'relaxation': 'Relaxation',
-                                    'strength': 'Strength',
-                                    'endurance': 'Endurance',
-                                    'longevity': 'Longevity'
-                                }
-                                
-                                for key, label in focus_map.items():
-                                    label_in_selected = False
-                                    if selected_focus:
-                                        for f in selected_focus:
-                                            if f.lower() == label.lower():
-                                                label_in_selected = True
-                                                break
-                                    if offer.get(key) and not label_in_selected:
-                                        additional_focus.append(label)
-                                
-                                # Get additional intensity if different
-                                additional_intensity = None
-                                offer_intensity_raw = offer.get('intensity')
-                                if offer_intensity_raw:
-                                    if isinstance(offer_intensity_raw, str):
-                                        offer_intensity = offer_intensity_raw.lower()
-                                    else:
-                                        offer_intensity = str(offer_intensity_raw).lower()
-                                    
-                                    intensity_in_selected = False
-                                    if selected_intensity:
-                                        for i in selected_intensity:
-                                            if i.lower() == offer_intensity:
-                                                intensity_in_selected = True
-                                                break
-                                    if offer_intensity and not intensity_in_selected:
-                                        additional_intensity = offer_intensity.capitalize()
-                                
-                                # Get additional setting tags not in user's selection
-                                additional_setting = []
-                                setting_map = {
-                                    'setting_team': 'Team',
-                                    'setting_fun': 'Fun',
-                                    'setting_duo': 'Duo',
-                                    'setting_solo': 'Solo',
-                                    'setting_competitive': 'Competitive'
-                                }
-                                
-                                for key, label in setting_map.items():
-                                    label_in_selected = False
-                                    if selected_setting:
-                                        for s in selected_setting:
-                                            if s.lower() == label.lower():
-                                                label_in_selected = True
-                                                break
-                                    if offer.get(key) and not label_in_selected:
-                                        additional_setting.append(label)
-                                
-                                # Build hover text
-                                hover_parts = [f"<b>{sport_name}</b>", f"Match: {match_score:.1f}%"]
-                                
-                                if additional_focus:
-                                    hover_parts.append(f"<br>Additional Focus: {', '.join(additional_focus[:3])}")
-                                if additional_intensity:
-                                    hover_parts.append(f"<br>Intensity: {additional_intensity}")
-                                if additional_setting:
-                                    hover_parts.append(f"<br>Additional Setting: {', '.join(additional_setting[:3])}")
-                                
-                                hover_texts.append("<br>".join(hover_parts))
-                            
                             # Create beautiful horizontal bar chart
                             fig = go.Figure()
                             
-                            # Prepare data for horizontal bars
-                            display_names = []
-                            for name in sport_names:
-                                if len(name) > 30:
-                                    display_name = f"{name[:30]}..."
-                                else:
-                                    display_name = name
-                                display_names.append(display_name)
+                            # Prepare data for horizontal bars (long names are cut to keep labels short)
+                            display_names = [
+                                f"{name[:_MAX_LABEL_LENGTH]}..." if len(name) > _MAX_LABEL_LENGTH else name
+                                for name in sport_names
+                            ]
                             
                             # Create hover tooltips with additional sport features (only show NON-selected tags)
                             recommendation_hover_tooltips = []
@@ -431,15 +325,8 @@ def render_analytics_section():
                                 additional_feature_tags = []
                                 
                                 # Show NON-selected focus tags that this sport has
-                                focus_tag_names = ['balance', 'flexibility', 'coordination', 'relaxation', 'strength', 'endurance', 'longevity']
-                                for focus_tag in focus_tag_names:
-                                    focus_tag_in_selected = False
-                                    if selected_focus:
-                                        for f in selected_focus:
-                                            if f.lower() == focus_tag:
-                                                focus_tag_in_selected = True
-                                                break
-                                    if offer.get(focus_tag, 0) == 1 and not focus_tag_in_selected:
+                                for focus_tag in _TOOLTIP_FOCUS_TAGS:
+                                    if offer.get(focus_tag, 0) == 1 and focus_tag not in selected_focus_lower:
                                         additional_feature_tags.append(f"🎯 {focus_tag.capitalize()}")
                                 
                                 # Show intensity if different from selected (handle both numeric and string values)
@@ -457,28 +344,13 @@ def render_analytics_section():
                                         intensity_level = str(sport_intensity).lower()
                                     
                                     # Check if this intensity is different from selected
-                                    intensity_in_selected = False
-                                    if selected_intensity:
-                                        for i in selected_intensity:
-                                            if i.lower() == intensity_level:
-                                                intensity_in_selected = True
-                                                break
-                                    if not selected_intensity or not intensity_in_selected:
+                                    if intensity_level not in selected_intensity_lower:
                                         additional_feature_tags.append(f"⚡ {intensity_level.capitalize()} Intensity")
                                 
                                 # Show NON-selected setting tags that this sport has
-                                setting_tag_names = ['setting_team', 'setting_fun', 'setting_duo', 'setting_solo', 'setting_competitive']
-                                for setting_tag in setting_tag_names:
-                                    if offer.get(setting_tag, 0) == 1:
-                                        setting_display_name = setting_tag.replace('setting_', '')
-                                        setting_in_selected = False
-                                        if selected_setting:
-                                            for s in selected_setting:
-                                                if s.lower() == setting_display_name:
-                                                    setting_in_selected = True
-                                                    break
-                                        if not setting_in_selected:
-                                            additional_feature_tags.append(f"🏃 {setting_display_name.capitalize()}")
+                                for setting_tag in _TOOLTIP_SETTING_TAGS:
+                                    if offer.get(f'setting_{setting_tag}', 0) == 1 and setting_tag not in selected_setting_lower:
+                                        additional_feature_tags.append(f"🏃 {setting_tag.capitalize()}")
                                 
                                 # Build hover text
                                 if additional_feature_tags:
@@ -491,24 +363,22 @@ def render_analytics_section():
                                                       f"Match Score: <b>{match_score:.1f}%</b><br>")
                             
                             # Add horizontal bars with gradient colors based on match scores
-                            bar_colors = []
-                            for item in chart_data_top10:
-                                bar_colors.append(item['match_score'])
+                            # (the bar colors are the match scores themselves, so reuse that list)
+                            min_score = min(match_scores)
+                            max_score = max(match_scores)
                             
                             # Build text labels for bars
-                            text_labels = []
-                            for score in match_scores:
-                                text_labels.append(f"<b>{score:.1f}%</b>")
+                            text_labels = [f"<b>{score:.1f}%</b>" for score in match_scores]
                             
                             fig.add_trace(go.Bar(
                                 y=display_names,
                                 x=match_scores,
                                 orientation='h',
                                 marker=dict(
-                                    color=bar_colors,
-                                    colorscale=[[0, '#D62828'], [0.5, '#FCBF49'], [1, '#06A77D']],  # Warm gradient: red -> orange -> teal
-                                    cmin=min(match_scores) if match_scores else 0,
-                                    cmax=max(match_scores) if match_scores else 100,
+                                    color=match_scores,
+                                    colorscale=_MATCH_SCORE_COLORSCALE,
+                                    cmin=min_score,
+                                    cmax=max_score,
                                     line=dict(color='rgba(255,255,255,0.8)', width=2),
                                     opacity=0.85
                                 ),
@@ -521,12 +391,6 @@ def render_analytics_section():
                             ))
                             
                             # Calculate dynamic range for x-axis
-                            if match_scores:
-                                min_score = min(match_scores)
-                                max_score = max(match_scores)
-                            else:
-                                min_score = 0
-                                max_score = 100
                             range_min = max(0, (int(min_score) // 10) * 10 - 5)
                             range_max = min(105, ((int(max_score) // 10) + 1) * 10 + 5)
                             
@@ -536,12 +400,12 @@ def render_analytics_section():
                                     text="Sports you might also like",
                                     x=0.5,
                                     xanchor='center',
-                                    font=dict(size=18, family='Arial', color='#000000')
+                                    font=_TITLE_FONT
                                 ),
                                 xaxis=dict(
                                     title="Match Score (%)",
                                     range=[range_min, range_max],
-                                    gridcolor='rgba(108, 117, 125, 0.1)',
+                                    gridcolor=_GRID_COLOR,
                                     showgrid=True,
                                     tickfont=dict(size=12, color='#666')
                                 ),
@@ -549,7 +413,7 @@ def render_analytics_section():
                                     title="Recommended Sports",
                                     tickfont=dict(size=11, color='#666'),
                                     autorange='reversed',  # Show highest scores at top
-                                    gridcolor='rgba(108, 117, 125, 0.1)',
+                                    gridcolor=_GRID_COLOR,
                                     showgrid=True
                                 ),
                                 height=max(400, len(chart_data_top10) * 35),
@@ -557,6 +421,7 @@ def render_analytics_section():
                                 paper_bgcolor='#FFFFFF',
                                 plot_bgcolor='rgba(0,0,0,0)',
                                 showlegend=False,
+                                hovermode='closest',
                                 font=dict(family='Inter, system-ui, sans-serif')
                             )
                             
@@ -585,28 +450,21 @@ def render_analytics_section():
                     st.info(f"🤖 **KI-Empfehlungen**: Keine Empfehlungen gefunden mit einem Match-Score ≥ {min_match}%. Versuchen Sie, den Mindest-Match-Score zu senken oder andere Filter auszuwählen.")
 
 
-def render_team_contribution_matrix(team_members, assets_path):
-    """Render a team contribution matrix heatmap showing each team member's contribution to different tasks.
-    
-    Creates a Plotly heatmap visualization that displays the contribution level
-    of each team member across different project tasks.
+@st.cache_resource
+def _team_contribution_figure(member_names):
+    """Build the team contribution heatmap once and keep the Figure object.
     
     Args:
-        team_members (list): List of dictionaries, each containing:
-            - 'name' (str): Full name of team member
-            - 'url' (str): LinkedIn profile URL
-            - 'avatar' (str): Path to avatar image
-        assets_path (Path): Path object pointing to the assets/images directory.
-            Currently unused but kept for API compatibility.
+        member_names (tuple): First names of the team members (x-axis labels).
+    
+    Returns:
+        plotly.graph_objects.Figure: The finished heatmap figure.
         
     Note:
-        Contribution levels are:
-        - 3 = Main Contribution (Blue)
-        - 2 = Contribution (Green)
-        - 1 = Supporting Role (Orange)
-        
-        The heatmap displays tasks on the y-axis and team members on the x-axis.
-        Hover tooltips show the contribution level for each cell.
+        st.cache_resource returns the SAME object on every call (no copy), so
+        callers must only display it and never change it. We cache the Figure
+        itself (not a dict) because rebuilding a Figure from a dict runs Plotly's
+        full validation again on every rerun.
     """
     # Define tasks (reversed order so first task appears at top)
     tasks = [
@@ -639,13 +497,11 @@ def render_team_contribution_matrix(team_members, assets_path):
     label_map = {3: "Main Contribution", 2: "Contribution", 1: "Supporting Role"}
     matrix_text = [[label_map[val] for val in row] for row in contribution_matrix]
     
-    member_names = [member["name"].split()[0] for member in team_members]  # First names only
-    
     # Create Plotly heatmap
     # Simple approach: directly use numeric values (3, 2, 1) for colors
     fig = go.Figure(data=go.Heatmap(
         z=contribution_matrix,
-        x=member_names,
+        x=list(member_names),
         y=tasks,
         text=matrix_text,
         colorscale=[
@@ -671,6 +527,38 @@ def render_team_contribution_matrix(team_members, assets_path):
         yaxis=dict(tickfont=dict(size=11))
     )
     
+    return fig
+
+
+def render_team_contribution_matrix(team_members, assets_path):
+    """Render a team contribution matrix heatmap showing each team member's contribution to different tasks.
+    
+    Creates a Plotly heatmap visualization that displays the contribution level
+    of each team member across different project tasks.
+    
+    Args:
+        team_members (list): List of dictionaries, each containing:
+            - 'name' (str): Full name of team member
+            - 'url' (str): LinkedIn profile URL
+            - 'avatar' (str): Path to avatar image
+        assets_path (Path): Path object pointing to the assets/images directory.
+            Currently unused but kept for API compatibility.
+        
+    Note:
+        Contribution levels are:
+        - 3 = Main Contribution (Blue)
+        - 2 = Contribution (Green)
+        - 1 = Supporting Role (Orange)
+        
+        The heatmap displays tasks on the y-axis and team members on the x-axis.
+        Hover tooltips show the contribution level for each cell.
+    """
+    member_names = tuple(member["name"].split()[0] for member in team_members)  # First names only
+    
+    # The matrix is static, so the Plotly figure is only built (and validated)
+    # once per set of team members; st.plotly_chart only reads it
+    fig = _team_contribution_figure(member_names)
+    
     st.plotly_chart(fig, use_container_width=True)
 
 # Parts of this codebase were developed with the assistance of AI-based tools (Cursor and Github Copilot)
@@ -11,6 +11,8 @@ users with Supabase.
 
 import streamlit as st
 from datetime import datetime, timezone
+from utils.filters import get_filter_session_keys
+from utils.db import create_or_update_user
 
 # =============================================================================
 # AUTHENTICATION STATUS
@@ -28,17 +30,36 @@ def is_logged_in():
         Streamlit automatically sets user info after successful login.
         We check if user email exists in the user data.
     """
+    return _get_logged_in_user() is not None
+
+
+def _get_logged_in_user():
+    """Return Streamlit's user object if a user is logged in.
+
+    Returns:
+        The ``st.user`` object if the user is logged in, None otherwise.
+
+    Note:
+        ``st.user`` is a proxy that looks up the current session context on every
+        access. Callers that need several attributes read it once through this helper
+        and then use the local reference.
+    """
     try:
-        user_info = st.user
-        return bool(user_info.get('email'))
+        user = st.user
+        return user if user.get('email') else None
     except (AttributeError, KeyError):
-        return False
+        return None
 
 # =============================================================================
 # SESSION MANAGEMENT
 # =============================================================================
 # PURPOSE: Functions for managing user session state
 
+# All session state keys that belong to a user: every filter key plus the app state
+_CLEARED_SESSION_KEYS = frozenset(get_filter_session_keys()) | frozenset(
+    {'selected_offer', 'sports_data', 'activity_filter_options', 'active_tab', 'user_id', 'user_synced_sub'}
+)
+
 def clear_user_session():
     """Clear all user-related data from Streamlit's session state.
     
@@ -51,23 +72,14 @@ def clear_user_session():
         Without clearing session state, the next user might see the previous user's filters
         and selections, which is a privacy and security issue.
     """
-    # Clear filter states
-    from utils.filters import get_filter_session_keys
-    filter_keys = get_filter_session_keys()
-    for key in filter_keys:
-        if key in st.session_state:
-            del st.session_state[key]
-    
-    # Clear app states
-    app_keys = ['selected_offer', 'sports_data', 'active_tab', 'user_id']
-    for key in app_keys:
-        if key in st.session_state:
-            del st.session_state[key]
+    # Clear filter and app states
+    # Only touch the keys that are actually set (one set intersection)
+    for key in _CLEARED_SESSION_KEYS.intersection(st.session_state.keys()):
+        del st.session_state[key]
     
     # Clear any cached data
-    for cache_attr in ('cache_data', 'cache_resource'):
-        if hasattr(st, cache_attr):
-            getattr(st, cache_attr).clear()
+    st.cache_data.clear()
+    st.cache_resource.clear()
 
 def handle_logout():
     """Perform a complete logout: clear data, log out, and refresh the UI.
@@ -101,7 +113,8 @@ def get_user_sub():
         This is part of the OIDC (OpenID Connect) standard. This ID is used to look up
         the user in the Supabase database and link their data.
     """
-    return st.user.sub if is_logged_in() else None
+    user = _get_logged_in_user()
+    return user.sub if user is not None else None
 
 def get_user_email():
     """Get the authenticated user's email address.
@@ -112,7 +125,8 @@ def get_user_email():
     Note:
         This comes directly from Google's authentication system.
     """
-    return st.user.email if is_logged_in() else None
+    user = _get_logged_in_user()
+    return user.email if user is not None else None
 
 def check_token_expiry():
     """Check if the user's authentication token has expired.
@@ -123,11 +137,12 @@ def check_token_expiry():
         When logging in, Google provides a token: a special code that proves authentication.
         Tokens expire for security reasons, so this must be checked periodically.
     """
-    if not is_logged_in():
+    user = _get_logged_in_user()
+    if user is None:
         return
 
     # Check if the identity provider returned expiration information
-    expires_at = getattr(st.user, 'expires_at', None)
+    expires_at = getattr(user, 'expires_at', None)
     if expires_at and datetime.now(timezone.utc) > expires_at:
         st.warning("Your session has expired. Please log in again.")
         handle_logout()
@@ -151,17 +166,18 @@ def get_user_info_dict():
         Use direct access for required fields. Optional fields use getattr() with None as default
         to avoid errors.
     """
-    if not is_logged_in():
+    user = _get_logged_in_user()
+    if user is None:
         return None
 
     return {
-        'sub': st.user.sub,
-        'email': st.user.email,
-        'name': st.user.name,
+        'sub': user.sub,
+        'email': user.email,
+        'name': user.name,
         'is_logged_in': True,
-        'given_name': getattr(st.user, 'given_name', None),
-        'family_name': getattr(st.user, 'family_name', None),
-        'picture': getattr(st.user, 'picture', None)
+        'given_name': getattr(user, 'given_name', None),
+        'family_name': getattr(user, 'family_name', None),
+        'picture': getattr(user, 'picture', None)
     }
 
 # =============================================================================
@@ -180,13 +196,18 @@ def sync_user_to_supabase():
     
     Note:
         Shows a warning if synchronization fails, but does not raise an exception.
+        Runs only once per session: Streamlit re-runs the script on every click,
+        and the user row does not change between reruns, so repeating the two
+        database round-trips (select + update) would only slow down every page.
     """
-    from utils.db import create_or_update_user
-    
     user_info = get_user_info_dict()
     if not user_info:
         return
     
+    # Already synced in this session (key is removed again on logout)
+    if st.session_state.get('user_synced_sub') == user_info["sub"]:
+        return
+    
     # Prepare user data with last_login timestamp
     user_data = {
         "sub": user_info["sub"],
@@ -199,6 +220,8 @@ def sync_user_to_supabase():
     # Attempt to save to database
     if create_or_update_user(user_data) is None:
         st.warning("⚠️ Error synchronizing user")
+    else:
+        st.session_state['user_synced_sub'] = user_info["sub"]
 
 # Parts of this codebase were developed with the assistance of AI-based tools (Cursor and Github Copilot)
 # All outputs generated by such systems were reviewed, validated, and modified by the author.
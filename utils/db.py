@@ -19,15 +19,26 @@ KEY CONCEPTS:
 """
 
 import streamlit as st
-import json
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
-from collections import defaultdict
+from collections import Counter, defaultdict
 from pathlib import Path
 from st_supabase_connection import SupabaseConnection
+from supabase import create_client
 import logging
 
+# Imported once at module level instead of inside each function.
+# WHY: A function-level import runs a sys.modules lookup on every call.
+# NOTE: utils.filters and utils.formatting never import utils.db at module
+# level, so importing them here cannot create a circular import.
+from utils.formatting import parse_event_datetime, WEEKDAY_NAMES
+from utils.filters import (
+    apply_ml_recommendations_to_offers,
+    filter_events,
+    has_offer_filters as check_offer_filters,
+)
+
 logger = logging.getLogger(__name__)
 
 # =============================================================================
@@ -85,7 +96,8 @@ def _handle_db_error(e, context="database operation"):
                                  Defaults to "database operation".
     """
     error_message = str(e)
-    logger.error(f"Error in {context}: {error_message}")
+    # Lazy %-style arguments: the message is only formatted if the record is emitted
+    logger.error("Error in %s: %s", context, error_message)
     
     # Categorize error types for better user feedback
     has_url_error = "URL not provided" in error_message or "url" in error_message.lower()
@@ -99,23 +111,6 @@ def _handle_db_error(e, context="database operation"):
     else:
         st.error(f"⚠️ **Failed to {context}**\n\nError: {error_message[:200]}")
 
-def _get_user_id(user_sub):
-    """Resolve user_id from user_sub.
-    
-    Internal helper to convert OIDC sub (external ID) to internal database user_id.
-    
-    Args:
-        user_sub (str): OIDC subject identifier (external user ID).
-    
-    Returns:
-        int or None: Internal database user_id if found, None otherwise.
-        
-    Note:
-        Database queries can fail, so error handling is important.
-    """
-    result = supaconn().table("users").select("id").eq("sub", user_sub).execute()
-    return result.data[0]['id'] if result.data else None
-
 def _has_sport_features(offer):
     """Check if offer has at least one sport feature (focus, setting, or intensity).
     
@@ -141,33 +136,27 @@ def _has_sport_features(offer):
     
     return has_focus or has_setting or has_intensity
 
-def _convert_event_fields(event):
-    """Convert event fields from database format to UI format.
+def _convert_events_batch(events):
+    """Convert a list of events from database format to UI format (in place).
     
     Args:
-        event (dict): Event dictionary from database.
+        events (list): Event dictionaries from database.
     
     Returns:
-        dict: Event dictionary with converted fields:
-            - trainers: Converted from JSON to list of trainer names
-            - details: Copied from kurs_details if present
+        list: The same list, each event's trainers converted to a list of trainer names.
     
     Note:
-        The database view returns trainers as JSON, we convert it to a list of names
-        for easier display in the UI. Also handles field name mapping (kurs_details → details).
+        vw_termine_full builds trainers as a JSONB array in Postgres (see schema.sql),
+        so PostgREST already delivers a decoded list - no json.loads needed in Python.
+        We only reduce it to the names for easier display in the UI.
+        Converts the whole list in one loop instead of one function call per event,
+        because get_events() loads every upcoming event (often thousands of rows).
     """
-    # Parse trainers from JSON string or use list directly
-    trainers_raw = event.get('trainers', '[]')
-    trainers = json.loads(trainers_raw) if isinstance(trainers_raw, str) else (trainers_raw or [])
-    
-    # Extract trainer names using list comprehension
-    event['trainers'] = [t['name'] for t in trainers if 'name' in t]
-    
-    # Copy kurs_details to details if it exists
-    if 'kurs_details' in event:
-        event['details'] = event['kurs_details']
+    for event in events:
+        # Extract trainer names using list comprehension
+        event['trainers'] = [t['name'] for t in event.get('trainers') or () if 'name' in t]
     
-    return event
+    return events
 
 # =============================================================================
 # USER MANAGEMENT
@@ -191,14 +180,14 @@ def create_or_update_user(user_data):
     if not user_sub:
         return None
     
-    conn = supaconn()
-    existing = conn.table("users").select("*").eq("sub", user_sub).execute()
+    # Update if exists, insert if new - in ONE request
+    # HOW: users.sub is UNIQUE, so Postgres can do INSERT ... ON CONFLICT (sub) DO UPDATE.
+    # This replaces a separate SELECT round-trip and cannot race between check and insert.
+    result = supaconn().table("users").upsert(user_data, on_conflict="sub").execute()
     
-    # Update if exists, insert if new
-    if existing.data:
-        result = conn.table("users").update(user_data).eq("sub", user_sub).execute()
-    else:
-        result = conn.table("users").insert(user_data).execute()
+    # The profile just changed, so the cached copy is outdated
+    # Passing user_sub clears only this user's entry, not every user's cached profile
+    get_user_complete.clear(user_sub)
     
     return result.data[0] if result.data else None
 
@@ -223,8 +212,6 @@ def get_ml_training_data_cli():
     Note:
         Creates a direct Supabase client connection (not using Streamlit's connection manager).
     """
-    from supabase import create_client
-    
     script_dir = Path(__file__).parent.absolute()
     # Projektwurzel (eine Ebene über utils/)
     parent_dir = script_dir.parent
@@ -280,17 +267,18 @@ def get_offers_complete():
         conn = supaconn()
         result = conn.table("vw_offers_complete").select("*").order("name").execute()
         # Filter offers that have sport features
-        filtered = []
-        for o in result.data:
-            if _has_sport_features(o):
-                filtered.append(o)
-        count = len(filtered)
-        logger.info(f"Loaded {count} offers with features from vw_offers_complete")
+        filtered = [o for o in result.data if _has_sport_features(o)]
+        logger.info("Loaded %d offers with features from vw_offers_complete", len(filtered))
         return filtered
     except Exception as e:
         _handle_db_error(e, "load sport offers")
         return []
 
+# Columns of vw_termine_full that the app actually reads (kursnr is never used)
+# WHY: select("*") would send every column for every event row; listing them
+#      lets PostgREST leave out the rest before it goes over the network
+_EVENT_COLUMNS = "offer_href,sport_name,location_name,start_time,end_time,canceled,trainers"
+
 @st.cache_data(ttl=300)
 def get_events(offer_href=None, sport_name=None, date_start=None, date_end=None):
     """Load future events from vw_termine_full view.
@@ -309,20 +297,27 @@ def get_events(offer_href=None, sport_name=None, date_start=None, date_end=None)
         list: List of event dictionaries with converted fields, or empty list on error.
         
     Note:
-        Fetches events in pages, applies direct filters (offer_href, date range),
-        then applies additional filters in Python (sport_name, date_start, date_end).
-        Some filtering is done in Python because Supabase views may not support
-        all filter operations directly. Database queries can fail, so we use try/except.
+        Fetches events in pages. offer_href, sport_name and the date range are sent
+        to Supabase as query filters, so only matching rows travel over the network.
+        The date range is sent with one day of slack on each side and then checked
+        exactly in Python, because the database may store start_time in a different
+        time zone than the date the user picked. Database queries can fail, so we use try/except.
     """
     try:
         conn = supaconn()
         now = datetime.now()
         now_string = now.isoformat()
-        query = conn.table("vw_termine_full").select("*").gte("start_time", now_string).order("start_time")
+        query = conn.table("vw_termine_full").select(_EVENT_COLUMNS).gte("start_time", now_string).order("start_time")
         if offer_href:
             query = query.eq("offer_href", offer_href)
-        # Note: sport_name, date_start, date_end filtering is done in Python after fetching
-        # because Supabase views may not support all filter operations directly
+        if sport_name:
+            query = query.eq("sport_name", sport_name)
+        # Date range: filter on the server with one day of slack (time zones),
+        # the exact check against the user's dates happens in Python below
+        if date_start and date_start - timedelta(days=1) > now.date():
+            query = query.gte("start_time", (date_start - timedelta(days=1)).isoformat())
+        if date_end:
+            query = query.lt("start_time", (date_end + timedelta(days=2)).isoformat())
         
         # Fetch events in pages of 1000
         events = []
@@ -341,17 +336,13 @@ def get_events(offer_href=None, sport_name=None, date_start=None, date_end=None)
             offset += page_size
         
         # Convert event fields for UI
-        converted_events = [_convert_event_fields(e) for e in events]
+        converted_events = _convert_events_batch(events)
         
-        # Apply additional filters in Python (if needed)
-        if sport_name:
-            converted_events = [e for e in converted_events if e.get('sport_name') == sport_name]
+        # Exact date check in Python (server only narrowed the range, see Note)
         if date_start:
-            from utils.formatting import parse_event_datetime
             converted_events = [e for e in converted_events 
                               if parse_event_datetime(e.get('start_time')).date() >= date_start]
         if date_end:
-            from utils.formatting import parse_event_datetime
             converted_events = [e for e in converted_events 
                               if parse_event_datetime(e.get('start_time')).date() <= date_end]
         
@@ -400,7 +391,6 @@ def load_and_filter_offers(filters=None, update_session_state=False):
         offers_data = get_offers_complete()
         
         # Check if offer filters are set (focus, intensity, or setting)
-        from utils.filters import has_offer_filters as check_offer_filters
         has_offer_filters = check_offer_filters(filters=filters) if filters else False
         
         # Get show_upcoming_only setting from filters
@@ -408,7 +398,6 @@ def load_and_filter_offers(filters=None, update_session_state=False):
         
         # Apply ML filtering if offer filters are set
         if has_offer_filters:
-            from utils.filters import apply_ml_recommendations_to_offers
             offers = apply_ml_recommendations_to_offers(
                 offers=[],
                 offers_data=offers_data,
@@ -486,7 +475,6 @@ def load_and_filter_events(filters=None, offer_href=None, show_spinner=False):
         # Always apply filter_events if filters are provided, as it handles hide_cancelled
         # and other filters that get_events() doesn't handle
         if filters:
-            from utils.filters import filter_events
             # get_events() already filtered by: single sport_name, date_start, date_end (if provided)
             # filter_events() handles: multiple sports, weekday, time, location, hide_cancelled
             events = filter_events(events, filters=filters)
@@ -548,7 +536,29 @@ def get_events_grouped_by_sport():
     return group_events_by('sport_name')
 
 
-@st.cache_data(ttl=60)
+@st.cache_data(ttl=300)
+def get_event_filter_options():
+    """Collect the sidebar options for sport and location from all events.
+    
+    Returns:
+        tuple: (sport_names, locations), each a sorted list of unique values.
+        
+    Note:
+        The options only change when the events change, so they are computed
+        once per cache period instead of scanning all events on every rerun.
+        Uses the same events as get_events_grouped_by_offer(). Cached for 300 seconds.
+    """
+    sport_names = set()
+    locations = set()
+    for events_list in get_events_grouped_by_offer().values():
+        for event in events_list:
+            if sport_name := event.get('sport_name'):
+                sport_names.add(sport_name)
+            if location_name := event.get('location_name'):
+                locations.add(location_name)
+    return sorted(sport_names), sorted(locations)
+
+@st.cache_data(ttl=600)
 def get_user_complete(user_sub):
     """Load complete user profile from users table.
     
@@ -559,7 +569,9 @@ def get_user_complete(user_sub):
         dict or None: Complete user profile dictionary, or None if not found or on error.
         
     Note:
-        Cached for 60 seconds, as profile rarely changes. Returns all user fields.
+        Cached for 10 minutes, as profile rarely changes. create_or_update_user()
+        clears this user's cache entry after every write, so a longer TTL never shows stale data.
+        Returns all user fields.
         Database queries can fail, so we use try/except for error handling.
     """
     try:
@@ -593,23 +605,30 @@ def count_by_field(data_source, field, _transform=None, sort_desc=False, default
     """
     try:
         data = get_events() if data_source == 'events' else get_offers_complete()
-        counts = defaultdict(int)
-        
+        # Count raw values first, then transform each distinct value only once
+        # WHY: Many items share the same raw value, so the (possibly expensive)
+        #      transform runs per distinct value instead of per item
+        single_values = Counter()
+        list_values = Counter()
         for item in data:
             value = item.get(field)
             if value:
                 if list_field and isinstance(value, list):
                     # Handle list fields (e.g., 'focus')
-                    for list_item in value:
-                        if list_item:
-                            transformed = _transform(list_item) if _transform else list_item
-                            if transformed:
-                                counts[transformed] += 1
+                    list_values.update(list_item for list_item in value if list_item)
                 else:
                     # Handle single value fields
-                    transformed = _transform(value) if _transform else value
-                    if transformed is not None:
-                        counts[transformed] += 1
+                    single_values[value] += 1
+        
+        counts = Counter()
+        for value, count in single_values.items():
+            transformed = _transform(value) if _transform else value
+            if transformed is not None:
+                counts[transformed] += count
+        for list_item, count in list_values.items():
+            transformed = _transform(list_item) if _transform else list_item
+            if transformed:
+                counts[transformed] += count
         
         result = dict(counts)
         
@@ -631,12 +650,10 @@ def get_events_by_weekday():
             Keys: 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'
             Values: Count of events for each weekday.
     """
-    from utils.formatting import parse_event_datetime
-    weekdays = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
     return count_by_field(
         'events', 'start_time',
         _transform=lambda x: parse_event_datetime(x).strftime('%A'),
-        default_keys=weekdays
+        default_keys=WEEKDAY_NAMES
     )
 
 @st.cache_data(ttl=300)
@@ -648,7 +665,6 @@ def get_events_by_hour():
             Keys: Integers from 0 to 23 representing hours of the day.
             Values: Count of events starting in each hour.
     """
-    from utils.formatting import parse_event_datetime
     return count_by_field(
         'events', 'start_time',
         _transform=lambda x: parse_event_datetime(x).hour,
@@ -41,6 +41,8 @@ filtered = filter_events(
 """
 
 from datetime import datetime, time, date
+from operator import itemgetter
+import numpy as np
 import streamlit as st
 from utils.formatting import parse_event_datetime
 
@@ -304,6 +306,34 @@ def get_filter_session_keys():
     """
     return list(FILTER_SESSION_DEFAULTS.keys())
 
+def get_activity_filter_options(sports_data):
+    """Collect the sidebar options for intensity, focus and setting.
+    
+    Args:
+        sports_data (list): List of all available sports offers from database.
+    
+    Returns:
+        tuple: (intensities, focuses, settings), each a sorted list of unique values.
+        
+    Note:
+        focus and setting are lists in the data, so their values are added with
+        update() instead of add(). All three are collected in a single pass.
+    """
+    intensities = set()
+    focuses = set()
+    settings = set()
+    for item in sports_data:
+        intensity = item.get('intensity')
+        if intensity:
+            intensities.add(intensity)
+        focus = item.get('focus')
+        if focus:
+            focuses.update(focus)
+        setting = item.get('setting')
+        if setting:
+            settings.update(setting)
+    return sorted(intensities), sorted(focuses), sorted(settings)
+
 def has_offer_filters(filters=None):
     """Check if any offer filters (focus/intensity/setting) are set.
     
@@ -431,8 +461,10 @@ def get_merged_recommendations(sports_data, filters, min_match_score=0):
         3. Merge both, keeping higher score when sport appears in both
         4. Apply soft filters and filter by threshold
     """
-    import numpy as np
-    from utils.ml_utils import load_knn_model, build_user_preferences_from_filters, ML_FEATURE_COLUMNS
+    # Imported here (not at module level) on purpose: utils.ml_utils and
+    # utils.db both import this module at load time, so a top-level import
+    # would be circular.
+    from utils.ml_utils import load_knn_model, build_user_preferences_from_filters, compute_sport_distances
     from utils.db import get_events_grouped_by_sport
     
     # Extract filter values
@@ -456,29 +488,22 @@ def get_merged_recommendations(sports_data, filters, min_match_score=0):
     merged_dict = {}
     
     if model_data:
-        knn_model = model_data['knn_model']
-        scaler = model_data['scaler']
-        sports_df = model_data['sports_df']
+        sport_names = model_data['sport_names']
         
         # Build user preferences from filters
         user_prefs = build_user_preferences_from_filters(
             selected_focus, selected_intensity, selected_setting
         )
         
-        # Build feature vector
-        user_vector = np.array([user_prefs.get(col, 0.0) for col in ML_FEATURE_COLUMNS]).reshape(1, -1)
-        
-        # Scale
-        user_vector_scaled = scaler.transform(user_vector)
-        
-        # Get all sports as neighbors
-        n_sports = len(sports_df)
-        distances, indices = knn_model.kneighbors(user_vector_scaled, n_neighbors=n_sports)
+        # Distance to every sport, visited from closest to farthest
+        distances = compute_sport_distances(model_data, user_prefs)
+        order = np.argsort(distances, kind='stable')
         
         # Add all KNN recommendations to merged dict
+        # (names and distances are converted to Python lists once, instead of
+        #  indexing NumPy arrays element by element inside the loop)
         offers_by_name = {o.get('name'): o for o in sports_data}
-        for distance, idx in zip(distances[0], indices[0]):
-            sport_name = sports_df.iloc[idx]['Angebot']
+        for sport_name, distance in zip(sport_names[order].tolist(), distances[order].tolist()):
             if sport_name in offers_by_name:
                 merged_dict[sport_name] = {
                     'name': sport_name,
@@ -536,7 +561,8 @@ def get_merged_recommendations(sports_data, filters, min_match_score=0):
                 'offer': offer
             })
     
-    return sorted(final_recommendations, key=lambda x: x['match_score'], reverse=True)
+    final_recommendations.sort(key=itemgetter('match_score'), reverse=True)
+    return final_recommendations
 
 # Parts of this codebase were developed with the assistance of AI-based tools (Cursor and Github Copilot)
 # All outputs generated by such systems were reviewed, validated, and modified by the author.
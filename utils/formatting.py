@@ -223,6 +223,15 @@ def parse_event_datetime(datetime_string):
     return datetime_string
 
 
+# Weekday names in calendar order (as returned by strftime('%A'))
+# WHY module-level: built once at import instead of on every call - format_weekday()
+# runs once per event row, and the sidebar/analytics reuse the same list
+WEEKDAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+# Full weekday name -> three-letter abbreviation ('Monday' -> 'Mon')
+_WEEKDAY_ABBREVIATIONS = {name: name[:3] for name in WEEKDAY_NAMES}
+
+
 def format_weekday(datetime_obj, abbreviated=False):
     """Format weekday from a datetime object.
     
@@ -243,16 +252,7 @@ def format_weekday(datetime_obj, abbreviated=False):
     weekday_name = datetime_obj.strftime('%A')
     
     if abbreviated:
-        weekday_abbreviations = {
-            'Monday': 'Mon',
-            'Tuesday': 'Tue',
-            'Wednesday': 'Wed',
-            'Thursday': 'Thu',
-            'Friday': 'Fri',
-            'Saturday': 'Sat',
-            'Sunday': 'Sun'
-        }
-        return weekday_abbreviations.get(weekday_name, weekday_name)
+        return _WEEKDAY_ABBREVIATIONS.get(weekday_name, weekday_name)
     
     return weekday_name
 
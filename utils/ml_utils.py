@@ -35,23 +35,30 @@ except ImportError:
     from utils.filters import filter_events, apply_soft_filters_to_score
     from utils.db import get_events
 
-# Feature order (13 features)
-ML_FEATURE_COLUMNS = [
-    'balance', 'flexibility', 'coordination', 'relaxation',
-    'strength', 'endurance', 'longevity',
-    'intensity',
-    'setting_team', 'setting_fun', 'setting_duo',
-    'setting_solo', 'setting_competitive'
-]
-
-# Intensity mapping values
-INTENSITY_VALUES = {'low': 0.33, 'moderate': 0.67, 'high': 1.0}
-DEFAULT_INTENSITY = 0.67  # Used when intensity value is not recognized
-
 # Feature lists
 FOCUS_FEATURES = ['balance', 'flexibility', 'coordination', 'relaxation', 
                   'strength', 'endurance', 'longevity']
 SETTING_FEATURES = ['team', 'fun', 'duo', 'solo', 'competitive']
+# (setting, feature column) pairs, so the column names are not rebuilt per call
+_SETTING_COLUMNS = tuple((feature, f'setting_{feature}') for feature in SETTING_FEATURES)
+
+# Feature order (13 features): 7 focus, intensity, 5 settings
+# Built from the lists above so the three can never drift apart
+ML_FEATURE_COLUMNS = (
+    FOCUS_FEATURES
+    + ['intensity']
+    + [column for _, column in _SETTING_COLUMNS]
+)
+
+# Intensity mapping values
+INTENSITY_VALUES = {'low': 0.33, 'moderate': 0.67, 'high': 1.0}
+DEFAULT_INTENSITY = 0.67  # Used when intensity value is not recognized
+# Same values under the spellings the filters use, so no .lower() is needed per call
+_INTENSITY_LOOKUP = {
+    spelling: value
+    for key, value in INTENSITY_VALUES.items()
+    for spelling in (key, key.capitalize(), key.upper())
+}
 
 ML_MODEL_PATH = Path(__file__).resolve().parent.parent / "ml" / "models" / "knn_recommender.joblib"
 
@@ -70,6 +77,11 @@ def load_knn_model():
             - 'knn_model': Trained KNN model
             - 'scaler': StandardScaler for feature normalization
             - 'sports_df': DataFrame with sports and features
+            - 'scaler_mean': The scaler's fitted feature means (ndarray)
+            - 'scaler_scale': The scaler's fitted feature scales (ndarray)
+            - 'sports_unit_vectors': Scaled sport features as unit-length rows (ndarray)
+            - 'sport_names': Sport names in the same row order (ndarray)
+            - 'rows_by_name': Sport name -> tuple of row indices (dict)
         Returns None if model file not found or error occurred.
         
     Note:
@@ -86,7 +98,7 @@ def load_knn_model():
         function can load it. The model file is saved as a .joblib file.
         
         Process:
-        1. Check if model file exists at ML_MODEL_PATH
+        1. Open the model file at ML_MODEL_PATH (with a 1 MiB read buffer)
         2. If not found: Show warning and return None
         3. If found: Load using joblib.load()
         4. Return dictionary with model components
@@ -103,21 +115,49 @@ def load_knn_model():
     # The model is stored alongside the scaler and source dataframe to
     # reproduce recommendation explanations (important for "why this sport?"
     # questions during evaluations).
-    if not ML_MODEL_PATH.exists():
-        model_path_str = str(ML_MODEL_PATH)
-        st.warning(f"⚠️ KNN model not found at {model_path_str}. Run train.py first.")
-        return None
-    
     try:
-        data = joblib.load(ML_MODEL_PATH)
+        # Open directly instead of checking exists() first (one file system call
+        # less); the large buffer means fewer reads while unpickling
+        with open(ML_MODEL_PATH, 'rb', buffering=1 << 20) as model_file:
+            data = joblib.load(model_file)
         knn_model = data['knn_model']
         scaler = data['scaler']
         sports_df = data['sports_df']
+        
+        # Fitted scaler parameters, so a single user vector can be scaled
+        # without going through scaler.transform()'s input validation
+        scaler_mean = np.asarray(scaler.mean_, dtype=np.float64)
+        scaler_scale = np.asarray(scaler.scale_, dtype=np.float64)
+        
+        # The sports never change after training, so scale them once here and
+        # normalize each row to length 1. Cosine distances to a user vector are
+        # then a single matrix-vector product (see compute_sport_distances).
+        sports_matrix = sports_df[ML_FEATURE_COLUMNS].fillna(0.0).to_numpy(dtype=np.float64)
+        sports_scaled = (sports_matrix - scaler_mean) / scaler_scale
+        row_norms = np.linalg.norm(sports_scaled, axis=1)
+        row_norms[row_norms == 0] = 1.0  # Same handling of all-zero rows as sklearn
+        
+        # Plain array of names, so lookups by row index skip building a pandas Series
+        sport_names = sports_df['Angebot'].to_numpy()
+        rows_by_name = {}
+        for row, name in enumerate(sport_names):
+            rows_by_name.setdefault(name, []).append(row)
+        
         return {
             'knn_model': knn_model,
             'scaler': scaler,
-            'sports_df': sports_df
+            'sports_df': sports_df,
+            'scaler_mean': scaler_mean,
+            'scaler_scale': scaler_scale,
+            'sports_unit_vectors': np.ascontiguousarray(sports_scaled / row_norms[:, np.newaxis]),
+            'sport_names': sport_names,
+            # Name -> rows lookup, so excluded sports can be matched by row index
+            'rows_by_name': {name: tuple(rows) for name, rows in rows_by_name.items()}
         }
+    except FileNotFoundError:
+        model_path_str = str(ML_MODEL_PATH)
+        st.warning(f"⚠️ KNN model not found at {model_path_str}. Run train.py first.")
+        return None
     except Exception as e:
         error_message = str(e)
         st.error(f"Error loading KNN model: {error_message}")
@@ -174,33 +214,115 @@ def build_user_preferences_from_filters(selected_focus, selected_intensity, sele
     """
     # Strings are manually mapped to floats instead of relying on pandas
     # so every component of the 13-D vector can be explained during demo sessions.
-    preferences = {}
-    
-    # Normalize inputs to lowercase for matching
-    focus_lower = [f.lower() for f in (selected_focus or [])]
-    setting_lower = [s.lower() for s in (selected_setting or [])]
+    # Normalize inputs to lowercase sets for matching (set lookups instead of list scans)
+    focus_lower = {f.lower() for f in (selected_focus or [])}
+    setting_lower = {s.lower() for s in (selected_setting or [])}
     
     # Focus features (7 binary)
-    for feature in FOCUS_FEATURES:
-        preferences[feature] = 1.0 if feature in focus_lower else 0.0
+    preferences = {
+        feature: 1.0 if feature in focus_lower else 0.0
+        for feature in FOCUS_FEATURES
+    }
     
     # Intensity (1 continuous) - average if multiple selected
     if selected_intensity:
-        intensity_values = [
-            INTENSITY_VALUES.get(i.lower(), DEFAULT_INTENSITY)
+        intensity_total = sum(
+            _INTENSITY_LOOKUP[i] if i in _INTENSITY_LOOKUP
+            else INTENSITY_VALUES.get(i.lower(), DEFAULT_INTENSITY)
             for i in selected_intensity
-        ]
-        preferences['intensity'] = sum(intensity_values) / len(intensity_values)
+        )
+        preferences['intensity'] = intensity_total / len(selected_intensity)
     else:
         preferences['intensity'] = 0.0
     
     # Setting features (5 binary)
-    for feature in SETTING_FEATURES:
-        preferences[f'setting_{feature}'] = 1.0 if feature in setting_lower else 0.0
+    for feature, column in _SETTING_COLUMNS:
+        preferences[column] = 1.0 if feature in setting_lower else 0.0
     
     return preferences
 
 
+def compute_sport_distances(model_data, user_prefs):
+    """Compute the cosine distance from the user's preferences to every sport.
+    
+    Does the same math as the KNN model (scaling + cosine distance), but
+    directly with NumPy on the sport vectors prepared by load_knn_model().
+    
+    Args:
+        model_data (dict): Model dictionary returned by load_knn_model().
+        user_prefs (dict): Feature values from build_user_preferences_from_filters().
+    
+    Returns:
+        numpy.ndarray: One distance per row of model_data['sports_df'] (same order).
+            0 = identical direction, 1 = unrelated, 2 = opposite.
+        
+    Note:
+        The data set is small (one row per sport), so one matrix-vector product
+        is much cheaper than the validation and sorting done by knn_model.kneighbors().
+    """
+    # A single user is just a batch of one
+    return compute_sport_distances_batch(model_data, [user_prefs])[0]
+
+
+def compute_sport_distances_batch(model_data, user_prefs_list):
+    """Compute the cosine distances for several preference profiles at once.
+    
+    Useful when comparing multiple hypothetical profiles (e.g. "what if I also
+    liked strength?") - all profiles are scored in one matrix product instead
+    of one NumPy call chain per profile.
+    
+    Args:
+        model_data (dict): Model dictionary returned by load_knn_model().
+        user_prefs_list (list): Feature dicts from build_user_preferences_from_filters().
+    
+    Returns:
+        numpy.ndarray: Shape (len(user_prefs_list), number of sports).
+            Row i holds the distances for user_prefs_list[i], same values
+            as compute_sport_distances(model_data, user_prefs_list[i]).
+    """
+    # Build feature matrix: one row per profile, columns in training order
+    n_features = len(ML_FEATURE_COLUMNS)
+    user_matrix = np.fromiter(
+        (prefs.get(col, 0.0) for prefs in user_prefs_list for col in ML_FEATURE_COLUMNS),
+        dtype=np.float64,
+        count=len(user_prefs_list) * n_features
+    ).reshape(-1, n_features)
+    
+    # Scale (same as scaler.transform(), using the cached mean and scale)
+    user_matrix_scaled = (user_matrix - model_data['scaler_mean']) / model_data['scaler_scale']
+    user_norms = np.linalg.norm(user_matrix_scaled, axis=1, keepdims=True)
+    user_norms[user_norms == 0] = 1.0
+    
+    # Cosine distance = 1 - cosine similarity (clipped like sklearn does)
+    similarities = (user_matrix_scaled / user_norms) @ model_data['sports_unit_vectors'].T
+    return np.clip(1.0 - similarities, 0.0, 2.0)
+
+
+def _iter_closest_first(distances, n_first):
+    """Yield sport row indices from closest to farthest, sorting lazily.
+    
+    Only the n_first closest sports are sorted up front (np.argpartition is a
+    linear-time partial selection). The remaining sports are only sorted if
+    the caller keeps iterating past them.
+    
+    Args:
+        distances (numpy.ndarray): Distance per sport from compute_sport_distances().
+        n_first (int): How many of the closest sports are expected to be needed.
+    
+    Yields:
+        int: Row index into the sports DataFrame.
+    """
+    n_sports = len(distances)
+    if n_first <= 0 or n_first >= n_sports:
+        yield from np.argsort(distances, kind='stable')
+        return
+    
+    partitioned = np.argpartition(distances, n_first - 1)
+    closest, rest = partitioned[:n_first], partitioned[n_first:]
+    yield from closest[np.argsort(distances[closest], kind='stable')]
+    yield from rest[np.argsort(distances[rest], kind='stable')]
+
+
 def get_ml_recommendations(selected_focus, selected_intensity, selected_setting, 
                           min_match_score=50, max_results=10, exclude_sports=None):
     """Get sport recommendations using machine learning (KNN algorithm).
@@ -235,7 +357,7 @@ def get_ml_recommendations(selected_focus, selected_intensity, selected_setting,
         1. Load the pre-trained KNN model
         2. Convert user filters to a 13-dimensional feature vector
         3. Normalize the vector using StandardScaler (so all features are on same scale)
-        4. Use KNN to find sports with similar feature vectors
+        4. Find sports with similar feature vectors (cosine distance, like the KNN model)
         5. Convert distances to similarity scores (0-100%)
         6. Filter by minimum match score
         7. Return top N recommendations
@@ -266,55 +388,60 @@ def get_ml_recommendations(selected_focus, selected_intensity, selected_setting,
     if model_data is None:
         return []
     
-    knn_model = model_data['knn_model']
-    scaler = model_data['scaler']
     sports_df = model_data['sports_df']
+    sport_names = model_data['sport_names']
     
     # Build user preferences from filters
     user_prefs = build_user_preferences_from_filters(
         selected_focus, selected_intensity, selected_setting
     )
     
-    # Build feature vector
-    feature_values = [user_prefs.get(col, 0.0) for col in ML_FEATURE_COLUMNS]
-    user_vector = np.array(feature_values).reshape(1, -1)
-    
-    # Scale
-    user_vector_scaled = scaler.transform(user_vector)
-    
-    # Get all sports as neighbors (filtering by threshold happens later)
-    n_sports = len(sports_df)
-    distances, indices = knn_model.kneighbors(user_vector_scaled, n_neighbors=n_sports)
-    
-    # Build recommendations
-    exclude_sports = set(exclude_sports or [])
-    recommendations = []
+    # Distance to every sport, then visit the sports from closest to farthest
+    # WHY: At most max_results plus the excluded sports are normally looked at,
+    #      so only those are sorted (the rest only if the loop gets that far)
+    distances = compute_sport_distances(model_data, user_prefs)
+    rows_by_name = model_data['rows_by_name']
+    excluded_rows = {
+        row
+        for name in set(exclude_sports or [])
+        for row in rows_by_name.get(name, ())
+    }
     
-    distances_list = distances[0]
-    indices_list = indices[0]
+    # Pick the matching sports first (row index + score)
+    matches = []
     
-    for distance, idx in zip(distances_list, indices_list):
-        sport_name = sports_df.iloc[idx]['Angebot']
-        
+    for idx in _iter_closest_first(distances, max_results + len(excluded_rows)):
         # Skip if in exclude list
-        if sport_name in exclude_sports:
+        if idx in excluded_rows:
             continue
         
         # Convert distance to similarity score (0-100%)
-        match_score = (1 - distance) * 100
+        match_score = (1 - distances[idx]) * 100
+        
+        # Scores only get lower from here, so stop at the first one below threshold
+        if match_score < min_match_score:
+            break
         
-        # Only include if above threshold
-        if match_score >= min_match_score:
-            recommendations.append({
-                'sport': sport_name,
-                'match_score': round(match_score, 1),
-                'item': sports_df.iloc[idx].to_dict()
-            })
+        matches.append((idx, match_score))
         
         # Stop if enough recommendations found
-        if len(recommendations) >= max_results:
+        if len(matches) >= max_results:
             break
     
+    if not matches:
+        return []
+    
+    # Convert only the selected rows to dicts, in one pandas call
+    items = sports_df.iloc[[idx for idx, _ in matches]].to_dict(orient='records')
+    recommendations = [
+        {
+            'sport': sport_names[idx],
+            'match_score': round(match_score, 1),
+            'item': item
+        }
+        for (idx, match_score), item in zip(matches, items)
+    ]
+    
     return recommendations
 
 